@@ -3,6 +3,38 @@
 from abc import ABC, abstractmethod
 from datetime import date
 from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Browser-like headers sent by all scrapers
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,sv;q=0.8',
+}
+
+# Retry requests that never reached the server (DNS hiccups, refused or reset
+# connects). Read timeouts and error statuses are not retried, since they
+# mean the site is slow or failing and retrying would only add to the wait.
+CONNECT_RETRY = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session for a scraper.
+
+    Connections are kept alive and pooled per host, so the requests a scraper
+    makes to the same site (e.g. ISS home page, restaurant page and API)
+    reuse one TCP/TLS connection instead of setting up a new one each time.
+    Failed connection attempts are retried a couple of times.
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=CONNECT_RETRY)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
 class BaseMenuScraper(ABC):
@@ -0,0 +1,229 @@
+"""Persistent on-disk cache for scraped menus."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# How long a fetched page is kept around for revalidation with the server
+HTTP_CACHE_TTL = 7 * 24 * 60 * 60
+
+# The restaurants publish the day's menu by this hour, so cached menus never
+# outlive it
+MENU_UPDATE_HOUR = 5
+
+# Per-thread record of whether fetch_text fell back to a stored copy
+_fallback = threading.local()
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory used for cache files.
+
+    Uses $RHLUNCH_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/rhlunch
+    (defaulting to ~/.cache/rhlunch).
+    """
+    override = os.environ.get('RHLUNCH_CACHE_DIR')
+    if override:
+        return Path(override)
+
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'rhlunch'
+
+
+def menu_ttl(ttl: float) -> float:
+    """
+    Cut a menu cache TTL off at the next menu update time.
+
+    Args:
+        ttl: Longest time to live in seconds
+
+    Returns:
+        The TTL, shortened so the entry expires by MENU_UPDATE_HOUR at the latest.
+    """
+    now = datetime.now()
+    next_update = now.replace(hour=MENU_UPDATE_HOUR, minute=0, second=0, microsecond=0)
+    if next_update <= now:
+        next_update += timedelta(days=1)
+    return min(ttl, (next_update - now).total_seconds())
+
+
+def _cache_path(key: tuple) -> Path:
+    """Map a cache key to its file path."""
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    return get_cache_dir() / f"{digest}.json"
+
+
+def get(key: tuple) -> Optional[Any]:
+    """
+    Get a cached value.
+
+    Args:
+        key: Tuple of JSON-friendly values identifying the entry
+
+    Returns:
+        The cached value, or None if missing, expired or unreadable.
+    """
+    entry = get_entry(key)
+    return entry[0] if entry is not None else None
+
+
+def get_entry(key: tuple) -> Optional[tuple]:
+    """
+    Get a cached value along with when it expires.
+
+    Args:
+        key: Tuple of JSON-friendly values identifying the entry
+
+    Returns:
+        (value, expires) tuple with the expiry as a time.time() timestamp, or
+        None if missing, expired or unreadable.
+    """
+    path = _cache_path(key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    expires = entry.get('expires', 0)
+    if expires < time.time():
+        logger.debug(f"Cache entry expired for {key}")
+        return None
+
+    logger.debug(f"Cache hit for {key}")
+    return entry.get('value'), expires
+
+
+def put(key: tuple, value: Any, ttl: float) -> None:
+    """
+    Store a value in the cache.
+
+    Failures to write are logged and otherwise ignored, since the cache is
+    only an optimization.
+
+    Args:
+        key: Tuple of JSON-friendly values identifying the entry
+        value: JSON-serializable value to store
+        ttl: Time to live in seconds
+    """
+    path = _cache_path(key)
+    try:
+        data = json.dumps({'key': list(key), 'expires': time.time() + ttl, 'value': value},
+                          ensure_ascii=False)
+    except (TypeError, ValueError) as e:
+        logger.debug(f"Could not serialize cache entry for {key}: {e}")
+        return
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent,
+                                         suffix='.tmp', delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+    except OSError as e:
+        logger.debug(f"Could not write cache entry for {key}: {e}")
+
+
+def delete(key: tuple) -> None:
+    """
+    Remove a value from the cache, if present.
+
+    Args:
+        key: Tuple of JSON-friendly values identifying the entry
+    """
+    try:
+        _cache_path(key).unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug(f"Could not delete cache entry for {key}: {e}")
+
+
+def reset_fallback() -> None:
+    """Forget earlier fallbacks to stored copies in this thread (see used_fallback)."""
+    _fallback.used = False
+
+
+def used_fallback() -> bool:
+    """
+    Check if fetch_text fell back to a stored copy in this thread.
+
+    A menu built from a stored copy may be out of date, so callers shouldn't
+    cache it. Call reset_fallback() before fetching.
+    """
+    return getattr(_fallback, 'used', False)
+
+
+def fetch_text(session, url: str, timeout: float = 10) -> str:
+    """
+    Fetch a URL, revalidating a previously stored copy with a conditional GET.
+
+    If an earlier response carried an ETag or Last-Modified header, it is sent
+    back as If-None-Match/If-Modified-Since, and a 304 Not Modified reuses the
+    stored body instead of downloading it again. If the site can't be reached
+    at all, a copy stored during the current ISO week is returned instead, and
+    used_fallback() reports it.
+
+    Args:
+        session: requests.Session to fetch with
+        url: URL to fetch
+        timeout: Request timeout in seconds
+
+    Returns:
+        The response body as text.
+
+    Raises:
+        requests.RequestException: If the request fails or returns an error status
+    """
+    key = ('http', url)
+    stored = get(key)
+    week = list(date.today().isocalendar()[:2])
+
+    headers = {}
+    if stored:
+        if stored.get('etag'):
+            headers['If-None-Match'] = stored['etag']
+        if stored.get('last_modified'):
+            headers['If-Modified-Since'] = stored['last_modified']
+
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        # Menu pages keep their URL from week to week, so an older copy would
+        # be last week's menu
+        if not stored or stored.get('week') != week:
+            raise
+        # The site is unreachable, so this week's last copy beats no menu at all
+        logger.warning(f"Could not reach {url} ({e}), using stored copy")
+        _fallback.used = True
+        return stored['body']
+
+    if response.status_code == 304 and stored:
+        logger.debug(f"Not modified, reusing stored copy of {url}")
+        if stored.get('week') != week:
+            # Still current, so it may stand in for the page this week too
+            put(key, dict(stored, week=week), HTTP_CACHE_TTL)
+        return stored['body']
+
+    if not response.ok:
+        logger.debug(f"Error response from {url}: {response.text}")
+    response.raise_for_status()
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        put(key, {'etag': etag, 'last_modified': last_modified, 'week': week,
+                  'body': response.text},
+            HTTP_CACHE_TTL)
+
+    return response.text
@@ -1,16 +1,50 @@
 """Command line interface for the lunch menu scraper."""
 
 import click
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 import logging
-from .iss_scraper import ISSMenuScraper
-from .kvartersmenyn_scraper import KvartersmenynsMenuScraper
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(levelname)s: %(message)s'
+from . import cache
+
+# How long fetched menus are reused before hitting the restaurant sites again,
+# at most until the next morning's menu update
+DAILY_CACHE_TTL = 24 * 60 * 60
+WEEKLY_CACHE_TTL = 7 * 24 * 60 * 60
+
+# English day names indexed by date.weekday()
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Swedish weekly menu keys with their English names, in display order
+SWEDISH_DAY_NAMES = (
+    ('måndag', 'Monday'),
+    ('tisdag', 'Tuesday'),
+    ('onsdag', 'Wednesday'),
+    ('torsdag', 'Thursday'),
+    ('fredag', 'Friday'),
+    ('lördag', 'Saturday'),
+    ('söndag', 'Sunday'),
 )
 
+# Styled strings shared by every render
+SEPARATOR = click.style("      " + "─" * 74, fg='cyan', dim=True)
+VEGETARIAN_BANNER = click.style("🥬  Vegetarian".center(80), fg='green', bold=True)
+FISH_BANNER = click.style("🐟  Fish".center(80), fg='blue', bold=True)
+MEAT_BANNER = click.style("🥩  Meat".center(80), fg='red', bold=True)
+WEEKLY_HEADER = click.style("  🍽️  WEEKLY LUNCH MENU", fg='bright_white', bold=True)
+DAILY_HEADER = click.style("  🍽️  LUNCH MENU", fg='bright_white', bold=True)
+NO_DAILY_ITEMS = click.style("      ❌ No menu items found for today", fg='yellow')
+NO_WEEKLY_ITEMS = click.style("          ❌ No menu available", fg='yellow')
+STYLED_DAY_HEADERS = {
+    day_key: click.style(f"      📅  {day_name}", fg='bright_yellow', bold=True)
+    for day_key, day_name in SWEDISH_DAY_NAMES
+}
+
+# ANSI codes for text that varies per render (click.echo strips them when the
+# output isn't a terminal, same as for click.style)
+_RESTAURANT_STYLE = click.style('', fg='bright_cyan', bold=True, reset=False)
+_DATE_STYLE = click.style('', fg='white', dim=True, reset=False)
+_RESET_STYLE = '\x1b[0m'
+
 # Restaurant configurations
 RESTAURANTS = {
     'gourmedia': {
@@ -45,9 +79,11 @@ RESTAURANTS = {
               help='Show only meat options.')
 @click.option('--week', '-w', is_flag=True,
               help='Show the whole week menu.')
+@click.option('--refresh', is_flag=True,
+              help='Ignore cached menus and fetch fresh ones.')
 @click.option('--debug', '-d', is_flag=True,
               help='Enable debug logging to show which date is being fetched.')
-def main(restaurant_key, vegetarian_only, fish_only, meat_only, week, debug):
+def main(restaurant_key, vegetarian_only, fish_only, meat_only, week, refresh, debug):
     """
     Get lunch menu from multiple restaurants.
 
@@ -58,8 +94,16 @@ def main(restaurant_key, vegetarian_only, fish_only, meat_only, week, debug):
         lunch -f                # Show only fish options
         lunch -m                # Show only meat options
         lunch -w                # Show whole week menu
+        lunch --refresh         # Bypass the menu cache
         lunch -d                # Enable debug logging
     """
+    # Configure logging here rather than at import, so importing the module
+    # doesn't override the caller's logging setup
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(levelname)s: %(message)s'
+    )
+
     # Enable debug logging if requested
     if debug:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -72,184 +116,222 @@ def main(restaurant_key, vegetarian_only, fish_only, meat_only, week, debug):
     else:
         restaurants_to_fetch = RESTAURANTS
 
-    # Fetch menus from all selected restaurants
-    all_menus = {}
+    # Fetch menus from all selected restaurants concurrently
+    configs = {}
     for key, config in restaurants_to_fetch.items():
-        try:
-            # Create appropriate scraper based on type
-            if config['type'] == 'iss':
-                scraper = ISSMenuScraper(config['url'], config['id'], config['name'])
-            elif config['type'] == 'kvartersmenyn':
-                scraper = KvartersmenynsMenuScraper(config['url'], config['name'])
-            else:
-                click.echo(f"⚠️  Unknown scraper type for {config['name']}", err=True)
-                continue
-
-            # Fetch menu
-            if week:
-                menu = scraper.get_weekly_menu()
-            else:
-                menu = scraper.get_menu_for_day()
-
-            all_menus[config['name']] = menu
-
-        except Exception as e:
-            click.echo(f"\n❌ Error fetching menu from {config['name']}:", err=True)
-            click.echo(f"   {e}", err=True)
-            if debug:
-                import traceback
-                traceback.print_exc()
+        if config['type'] not in ('iss', 'kvartersmenyn'):
+            click.echo(f"⚠️  Unknown scraper type for {config['name']}", err=True)
+            continue
+        configs[key] = config
+
+    shown = _show_menus(configs, week, refresh, vegetarian_only, fish_only, meat_only, debug)
 
-    # Display results
-    if not all_menus:
+    if not shown:
         click.echo("\n❌ Failed to fetch any menus", err=True)
         click.echo("\nTry running with --debug (-d) flag for more details.", err=True)
         raise click.Abort()
 
+
+def _show_menus(configs, week, refresh, vegetarian_only, fish_only, meat_only, debug):
+    """
+    Fetch menus concurrently and print each restaurant as soon as it arrives.
+
+    Restaurants are shown in the order their fetches finish, so a slow site
+    doesn't hold back the others. The header is printed with the first menu,
+    so nothing but the error messages is shown if every fetch fails.
+
+    Returns:
+        Number of restaurants shown.
+    """
+    shown = 0
+    for config, result in _fetch_menus_as_completed(configs, week, refresh):
+        if isinstance(result, Exception):
+            click.echo(f"\n❌ Error fetching menu from {config['name']}:", err=True)
+            click.echo(f"   {result}", err=True)
+            if debug:
+                import traceback
+                traceback.print_exception(result)
+            continue
+
+        if week:
+            lines = _render_weekly_menu(config['name'], result,
+                                        vegetarian_only, fish_only, meat_only)
+        else:
+            lines = _render_daily_menu(config['name'], result,
+                                       vegetarian_only, fish_only, meat_only)
+
+        if shown:
+            # Spacing between restaurants
+            lines.insert(0, '')
+        else:
+            lines[:0] = _render_header(week)
+        click.echo('\n'.join(lines))
+        shown += 1
+
+    if shown:
+        click.echo()
+    return shown
+
+
+def _create_scraper(config):
+    """
+    Create the appropriate scraper for a restaurant configuration.
+
+    Scraper modules are imported here rather than at the top of the module so
+    that only the scrapers actually needed (none on a cache hit) get loaded,
+    along with their requests/bs4 dependencies.
+    """
+    if config['type'] == 'iss':
+        from .iss_scraper import ISSMenuScraper
+        return ISSMenuScraper(config['url'], config['id'], config['name'])
+
+    from .kvartersmenyn_scraper import KvartersmenynsMenuScraper
+    return KvartersmenynsMenuScraper(config['url'], config['name'])
+
+
+def _fetch_menu(restaurant_key, config, week, refresh=False):
+    """
+    Fetch the daily or weekly menu for a single restaurant (blocking).
+
+    Menus are cached on disk per restaurant and ISO week (weekly view) or
+    date (daily view), so repeated runs don't hit the restaurant sites. The
+    cached menus expire at the next menu update, so a menu fetched before the
+    sites publish the new one isn't kept.
+    """
+    today = date.today()
+    iso_year, iso_week, _ = today.isocalendar()
+    cache_key = (restaurant_key, iso_year, iso_week, 'week' if week else today.isoformat())
+
+    if not refresh:
+        menu = cache.get(cache_key)
+        if menu is not None:
+            return menu
+
+    scraper = _create_scraper(config)
+    cache.reset_fallback()
     if week:
-        display_all_weekly_menus(all_menus, vegetarian_only, fish_only, meat_only)
+        menu = scraper.get_weekly_menu()
     else:
-        display_all_daily_menus(all_menus, vegetarian_only, fish_only, meat_only)
+        menu = scraper.get_menu_for_day(today)
+
+    # Don't keep a menu built from a stored page while the site was down
+    if not cache.used_fallback():
+        cache.put(cache_key, menu, cache.menu_ttl(WEEKLY_CACHE_TTL if week else DAILY_CACHE_TTL))
+    return menu
+
+
+def _fetch_menus_as_completed(configs, week, refresh=False):
+    """
+    Fetch menus from several restaurants concurrently.
+
+    The scrapers are synchronous and I/O bound, so each one runs in a worker
+    thread and the total wall time is bounded by the slowest restaurant
+    instead of the sum.
+
+    Args:
+        configs: Dict of restaurant key to restaurant configuration
+        week: Fetch the weekly menu instead of today's
+        refresh: Bypass the menu cache
 
+    Yields:
+        (config, menu) tuples as each fetch finishes, with the raised
+        exception in place of the menu if the fetch failed.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(configs)))) as executor:
+        futures = {executor.submit(_fetch_menu, key, config, week, refresh): config
+                   for key, config in configs.items()}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def _render_day(out, menu, indent, vegetarian_only, fish_only, meat_only):
+    """
+    Append the category sections of one day's menu to the output lines.
+
+    Args:
+        out: List of output lines to append to
+        menu: Dict with 'vegetarian', 'fish' and 'meat' lists of dishes
+        indent: Prefix for each dish line
+
+    Returns:
+        True if any dishes were shown.
+    """
+    has_items = False
+
+    # Show vegetarian options
+    if not meat_only and not fish_only and menu.get('vegetarian'):
+        has_items = True
+        out.extend(('', VEGETARIAN_BANNER, ''))
+        for item in menu['vegetarian']:
+            out.append(f"{indent}{item}")
+
+    # Show fish options
+    if not vegetarian_only and not meat_only and menu.get('fish'):
+        has_items = True
+        out.extend(('', FISH_BANNER, ''))
+        for item in menu['fish']:
+            out.append(f"{indent}{item}")
+
+    # Show meat options
+    if not vegetarian_only and not fish_only and menu.get('meat'):
+        has_items = True
+        out.extend(('', MEAT_BANNER, ''))
+        for item in menu['meat']:
+            out.append(f"{indent}{item}")
+
+    return has_items
+
+
+def _render_header(week):
+    """Render the lines of the menu header."""
+    if week:
+        return ['', WEEKLY_HEADER, '']
 
-def display_all_daily_menus(all_menus, vegetarian_only, fish_only, meat_only):
-    """Display daily menus from multiple restaurants."""
     today = date.today()
-    day_names = {
-        0: 'Monday',
-        1: 'Tuesday',
-        2: 'Wednesday',
-        3: 'Thursday',
-        4: 'Friday',
-        5: 'Saturday',
-        6: 'Sunday'
-    }
-    day_name = day_names[today.weekday()]
-
-    # Header
-    click.echo()
-    click.echo(click.style("  🍽️  LUNCH MENU", fg='bright_white', bold=True) +
-               click.style(f"  •  {day_name}, {today.strftime('%B %d, %Y')}", fg='white', dim=True))
-    click.echo()
-
-    for i, (restaurant_name, menu) in enumerate(all_menus.items()):
-        # Restaurant header with emoji and bold name
-        click.echo(click.style(f"  📍  {restaurant_name.upper()}", fg='bright_cyan', bold=True))
-        click.echo(click.style("      " + "─" * 74, fg='cyan', dim=True))
-
-        has_items = False
-
-        # Show vegetarian options
-        if not meat_only and not fish_only and menu.get('vegetarian'):
-            has_items = True
-            click.echo()
-            click.echo(click.style("🥬  Vegetarian".center(80), fg='green', bold=True))
-            click.echo()
-            for item in menu['vegetarian']:
-                click.echo(f"      {item}")
-
-        # Show fish options
-        if not vegetarian_only and not meat_only and menu.get('fish'):
-            has_items = True
-            click.echo()
-            click.echo(click.style("🐟  Fish".center(80), fg='blue', bold=True))
-            click.echo()
-            for item in menu['fish']:
-                click.echo(f"      {item}")
-
-        # Show meat options
-        if not vegetarian_only and not fish_only and menu.get('meat'):
-            has_items = True
-            click.echo()
-            click.echo(click.style("🥩  Meat".center(80), fg='red', bold=True))
-            click.echo()
-            for item in menu['meat']:
-                click.echo(f"      {item}")
-
-        # Handle case where no menu items found
-        if not has_items:
-            click.echo(click.style("      ❌ No menu items found for today", fg='yellow'))
-
-        # Add spacing between restaurants (except for the last one)
-        if i < len(all_menus) - 1:
-            click.echo()
-
-    click.echo()
-
-
-def display_all_weekly_menus(all_menus, vegetarian_only, fish_only, meat_only):
-    """Display weekly menus from multiple restaurants."""
-    # Header
-    click.echo()
-    click.echo(click.style("  🍽️  WEEKLY LUNCH MENU", fg='bright_white', bold=True))
-    click.echo()
-
-    day_names = {
-        'måndag': 'Monday',
-        'tisdag': 'Tuesday',
-        'onsdag': 'Wednesday',
-        'torsdag': 'Thursday',
-        'fredag': 'Friday',
-        'lördag': 'Saturday',
-        'söndag': 'Sunday'
-    }
+    day_name = DAY_NAMES[today.weekday()]
+    return ['',
+            f"{DAILY_HEADER}{_DATE_STYLE}  •  {day_name}, {today.strftime('%B %d, %Y')}{_RESET_STYLE}",
+            '']
+
+
+def _render_daily_menu(restaurant_name, menu, vegetarian_only, fish_only, meat_only):
+    """Render the lines of one restaurant's daily menu."""
+    # Restaurant header with emoji and bold name
+    out = [f"{_RESTAURANT_STYLE}  📍  {restaurant_name.upper()}{_RESET_STYLE}", SEPARATOR]
+
+    # Handle case where no menu items found
+    if not _render_day(out, menu, "      ", vegetarian_only, fish_only, meat_only):
+        out.append(NO_DAILY_ITEMS)
+
+    return out
+
+
+def _render_weekly_menu(restaurant_name, weekly_menu, vegetarian_only, fish_only, meat_only):
+    """Render the lines of one restaurant's weekly menu."""
+    # Restaurant header
+    out = [f"{_RESTAURANT_STYLE}  📍  {restaurant_name.upper()}{_RESET_STYLE}", SEPARATOR]
+
+    for day_key, day_header in STYLED_DAY_HEADERS.items():
+        if day_key in weekly_menu:
+            menu = weekly_menu[day_key]
+
+            # Skip if no menu items and it's a weekend
+            if not menu.get('vegetarian') and not menu.get('fish') and not menu.get('meat'):
+                if day_key in ['lördag', 'söndag']:
+                    continue  # Skip empty weekends
+
+            # Day header
+            out.append('')
+            out.append(day_header)
+
+            # Show message if no items found
+            if not _render_day(out, menu, "          ", vegetarian_only, fish_only, meat_only):
+                out.append(NO_WEEKLY_ITEMS)
 
-    for rest_idx, (restaurant_name, weekly_menu) in enumerate(all_menus.items()):
-        # Restaurant header
-        click.echo(click.style(f"  📍  {restaurant_name.upper()}", fg='bright_cyan', bold=True))
-        click.echo(click.style("      " + "─" * 74, fg='cyan', dim=True))
-
-        for day_key, day_name in day_names.items():
-            if day_key in weekly_menu:
-                menu = weekly_menu[day_key]
-
-                # Skip if no menu items and it's a weekend
-                if not menu.get('vegetarian') and not menu.get('fish') and not menu.get('meat'):
-                    if day_key in ['lördag', 'söndag']:
-                        continue  # Skip empty weekends
-
-                # Day header
-                click.echo()
-                click.echo(click.style(f"      📅  {day_name}", fg='bright_yellow', bold=True))
-
-                has_items = False
-
-                # Show vegetarian options
-                if not meat_only and not fish_only and menu.get('vegetarian'):
-                    has_items = True
-                    click.echo()
-                    click.echo(click.style("🥬  Vegetarian".center(80), fg='green', bold=True))
-                    click.echo()
-                    for item in menu['vegetarian']:
-                        click.echo(f"          {item}")
-
-                # Show fish options
-                if not vegetarian_only and not meat_only and menu.get('fish'):
-                    has_items = True
-                    click.echo()
-                    click.echo(click.style("🐟  Fish".center(80), fg='blue', bold=True))
-                    click.echo()
-                    for item in menu['fish']:
-                        click.echo(f"          {item}")
-
-                # Show meat options
-                if not vegetarian_only and not fish_only and menu.get('meat'):
-                    has_items = True
-                    click.echo()
-                    click.echo(click.style("🥩  Meat".center(80), fg='red', bold=True))
-                    click.echo()
-                    for item in menu['meat']:
-                        click.echo(f"          {item}")
-
-                # Show message if no items found
-                if not has_items:
-                    click.echo(click.style("          ❌ No menu available", fg='yellow'))
-
-        # Add spacing between restaurants (except for the last one)
-        if rest_idx < len(all_menus) - 1:
-            click.echo()
-
-    click.echo()
+    return out
 
 
 if __name__ == '__main__':
@@ -1,195 +1,322 @@
 """Classifier for categorizing restaurant dishes."""
 
 import re
-from typing import Dict, List, Tuple
-
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+
+def _trie_pattern(node: dict) -> str:
+    """Build the regex for a keyword trie node (see _compile_keywords)."""
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if '' in node:
+        # A keyword ends here; the rest is optional and greedy, so longer keywords win
+        return f'(?:{body})?'
+    return body
+
+
+def _compile_keywords(keywords: Iterable[str]) -> re.Pattern:
+    """
+    Compile keywords into one regex shaped as a prefix trie.
+
+    Keywords are lowercased here, since dishes are matched in lowercase.
+
+    Keywords sharing a prefix share a branch, so each position in the text is
+    only tried against the characters that can still lead to a keyword, rather
+    than against every keyword in turn as a flat alternation would.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return re.compile(_trie_pattern(trie))
+
+
+def _compile_markers(category_markers: Dict[str, Iterable[str]]) -> re.Pattern:
+    """
+    Compile category markers into one anchored regex.
+
+    Matches a marker on its own or followed by a colon (e.g. "Fisk: dagens rätt").
+    The matching category is available as the name of the matched group.
+    """
+    groups = []
+    for category, markers in category_markers.items():
+        base_markers = {marker.rstrip(':') for marker in markers}
+        groups.append(f'(?P<{category}>{_compile_keywords(base_markers).pattern})')
+    return re.compile(f"(?:{'|'.join(groups)})(?::|\\Z)")
+
+
+# Category markers that appear in menus
+CATEGORY_MARKERS = {
+    'vegetarian': (
+        'vegetariskt:', 'vegetariskt', 'vego:', 'vego', 'vegansk:', 'vegansk',
+        'vegan:', 'vegan', 'vegetarisk:', 'vegetarisk', 'grönt:', 'grönt',
+        'växtbaserat:', 'växtbaserat', 'veganskt alternativ:', 'veganskt alternativ'
+    ),
+    'fish': (
+        'fisk:', 'fisk', 'fiskrätt:', 'fiskrätt', 'dagens fisk:', 'dagens fisk',
+        'skaldjur:', 'skaldjur'
+    ),
+    'meat': (
+        'kött:', 'kött', 'kötträtt:', 'kötträtt', 'dagens kött:', 'dagens kött',
+        'fågel:', 'fågel'
+    )
+}
+
+# Ingredient keywords for classification
+FISH_KEYWORDS = (
+    'fisk', 'lax', 'torsk', 'sej', 'räkor', 'scampi', 'hummer', 'skaldjur',
+    'tonfisk', 'sill', 'strömming', 'gös', 'abborre', 'sardiner', 'makrill',
+    'hälleflundra', 'rödspätta', 'piggvar', 'havskräfta', 'kummel', 'fish'
+)
+
+MEAT_KEYWORDS = (
+    'kött', 'kyckling', 'fläsk', 'biff', 'oxfilé', 'kalv', 'lamm', 'älg',
+    'ren', 'ankbröst', 'fågel', 'entrecote', 'ryggbiff', 'sidfläsk',
+    'bacon', 'chorizo', 'korv', 'köttbullar', 'hamburgare', 'schnitzel',
+    'frikadeller', 'pulled pork', 'revbensspjäll', 'korvstroganoff',
+    'wallenbergare', 'pytt i panna', 'raggmunk med fläsk', 'coq au vin',
+    'porchetta', 'färsbiff', 'kycklinglår', 'nötkött', 'fläskkarré'
+)
+
+VEGETARIAN_KEYWORDS = (
+    'vego', 'vegan', 'vegetarisk', 'halloumi', 'falafel', 'tempeh',
+    'tofu', 'vegansk', 'vegetariskt', 'bönor', 'linser', 'quinoa',
+    'seitan', 'svampgryta', 'svampsås', 'svampsoppa', 'rotselleri', 'selleri',
+    'kikärtor', 'grönsaker', 'vegoburgare', 'vegoköttbullar', 'chili med bönor',
+    'böff ala lindström', 'gnocchi', 'zucchini', 'aubergine', 'moussaka på vegofärs',
+    'långbakad rotselleri', 'skogssvamp', 'tempura svamp', 'tortellini', 'ricotta',
+    'spenat'
+)
+
+# Special Swedish dishes that should be classified as meat
+MEAT_DISHES = (
+    'ärtsoppa',  # Usually served with pork
+    'pannkaka'   # Context-dependent but traditionally with pork soup
+)
+
+# Explicit vegan/vegetarian markers and strong vegetable indicators that
+# override meat keywords (e.g. "Ärtsoppa/Vegan", "Morotsbiff")
+EXPLICIT_VEGETARIAN_MARKERS = (
+    'vegan', 'vegansk', 'vegetarisk', 'vegetariskt', 'vego', 'morot', 'morötter'
+)
+
+# Words that make an otherwise unclassified text look like a dish
+# (e.g. "Dagens gryta serveras med ris"), which then defaults to meat
+MEAT_HINT_WORDS = frozenset({'serveras', 'med', 'till', 'samt', 'och'})
+
+# Labels/headers to skip (not actual dishes)
+SKIP_LABELS = (
+    'extra', 'övrig', 'övrigt', 'dessert', 'tillbehör'
+)
+
+# Precompiled patterns so each check is a single scan in the regex engine
+_MARKER_CATEGORIES = {
+    marker.lower(): category
+    for category, markers in CATEGORY_MARKERS.items()
+    for marker in markers
+}
+_MARKER_RE = _compile_markers(CATEGORY_MARKERS)
+_EXPLICIT_VEGETARIAN_RE = _compile_keywords(EXPLICIT_VEGETARIAN_MARKERS)
+_MEAT_DISHES_RE = _compile_keywords(MEAT_DISHES)
+_MEAT_RE = _compile_keywords(MEAT_KEYWORDS)
+_FISH_RE = _compile_keywords(FISH_KEYWORDS)
+_VEGETARIAN_RE = _compile_keywords(VEGETARIAN_KEYWORDS)
+_ANY_KEYWORD_RE = _compile_keywords(FISH_KEYWORDS + MEAT_KEYWORDS + VEGETARIAN_KEYWORDS)
+_SKIP_LABEL_RE = _compile_keywords(SKIP_LABELS)
+_MEAT_HINT_RE = re.compile(rf'\b(?:{_compile_keywords(MEAT_HINT_WORDS).pattern})\b')
+
+
+def classify_dish(dish: str, previous_category: str = None) -> str:
+    """
+    Classify a single dish into vegetarian, meat, or fish.
+
+    Args:
+        dish: The dish text to classify
+        previous_category: If the dish follows a category marker, use this
+
+    Returns:
+        Category string: 'vegetarian', 'meat', or 'fish'
+    """
+    # Too short to hold any keyword or marker even before stripping, so the
+    # result can only be the carried-over category; skip the string work
+    if not dish or len(dish) < 3:
+        return previous_category
+    return _classify(dish.lower().strip(), previous_category)[0]
+
+
+@lru_cache(maxsize=2048)
+def _classify(dish_lower: str, previous_category: str = None) -> Tuple[str, bool]:
+    """
+    Classify a lowercased, stripped dish (see classify_dish).
+
+    Cached, since the same dishes and markers tend to repeat across the days
+    of a weekly menu and across runs of the MCP server.
+
+    Returns:
+        Tuple of (category, keyword_match), where keyword_match tells whether
+        the dish contains any fish, meat or vegetarian keyword.
+    """
+    # Check if this is a category marker itself
+    # Only match if it's EXACTLY the marker or the marker followed by a colon
+    # (e.g., "Fisk:" or "Fisk: dagens rätt")
+    # Bare markers are a dict lookup, the regex handles a marker followed by a dish
+    marker_category = _MARKER_CATEGORIES.get(dish_lower)
+    if marker_category:
+        return f'marker:{marker_category}', False
+    marker_match = _MARKER_RE.match(dish_lower)
+    if marker_match:
+        return f'marker:{marker_match.lastgroup}', False
+
+    # Check for explicit vegan/vegetarian markers first (highest priority)
+    # This catches dishes like "Ärtsoppa/Vegan" even if they contain meat keywords
+    # Also includes strong vegetable indicators to override "biff" in vegetable patties
+    if _EXPLICIT_VEGETARIAN_RE.search(dish_lower):
+        return 'vegetarian', bool(_ANY_KEYWORD_RE.search(dish_lower))
+
+    # Check for special meat dishes that should override category markers
+    # (e.g., "Ärtsoppa" after "Vegetariskt:" marker should still be meat)
+    if _MEAT_DISHES_RE.search(dish_lower):
+        return 'meat', bool(_ANY_KEYWORD_RE.search(dish_lower))
+
+    # Check for meat keywords to avoid false positives
+    # (e.g., "fläsk" contains "fisk" as substring, but should be classified as meat)
+    if _MEAT_RE.search(dish_lower):
+        return 'meat', True
+
+    # Check for fish keywords
+    if _FISH_RE.search(dish_lower):
+        return 'fish', True
+
+    # Check for vegetarian keywords
+    if _VEGETARIAN_RE.search(dish_lower):
+        return 'vegetarian', True
+
+    # If previous line was a category marker, use that as fallback
+    # This comes AFTER keyword checks so that explicit dishes override markers
+    if previous_category:
+        return previous_category, False
+
+    # Default to meat if it looks like a dish (has serveras, med, etc.)
+    if _MEAT_HINT_RE.search(dish_lower):
+        return 'meat', False
+
+    # If we can't determine, return None
+    return None, False
+
+
+def classify_dishes(dishes: List[str]) -> Dict[str, List[str]]:
+    """
+    Classify a list of dishes into categories.
+
+    Args:
+        dishes: List of dish strings to classify
+
+    Returns:
+        Dictionary with 'vegetarian', 'meat', and 'fish' categories
+    """
+    if not dishes:
+        return {'vegetarian': [], 'meat': [], 'fish': []}
+
+    # Fresh lists on every call, so callers can't modify the cached result
+    return {category: list(items) for category, items in _classify_dishes(tuple(dishes)).items()}
+
+
+@lru_cache(maxsize=256)
+def _classify_dishes(dishes: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """
+    Classify a tuple of dishes (see classify_dishes).
+
+    Cached, since the scrapers classify the same day menus again whenever the
+    week is fetched anew.
+    """
+    categorized = {
+        'vegetarian': [],
+        'meat': [],
+        'fish': []
+    }
 
-class DishClassifier:
-    """Classifier for categorizing dishes into vegetarian, meat, and fish."""
-
-    # Category markers that appear in menus
-    CATEGORY_MARKERS = {
-        'vegetarian': [
-            'vegetariskt:', 'vegetariskt', 'vego:', 'vego', 'vegansk:', 'vegansk',
-            'vegan:', 'vegan', 'vegetarisk:', 'vegetarisk', 'grönt:', 'grönt',
-            'växtbaserat:', 'växtbaserat', 'veganskt alternativ:', 'veganskt alternativ'
-        ],
-        'fish': [
-            'fisk:', 'fisk', 'fiskrätt:', 'fiskrätt', 'dagens fisk:', 'dagens fisk',
-            'skaldjur:', 'skaldjur'
-        ],
-        'meat': [
-            'kött:', 'kött', 'kötträtt:', 'kötträtt', 'dagens kött:', 'dagens kött',
-            'fågel:', 'fågel'
-        ]
+    # Bound appends per category, looked up once per call rather than per dish
+    appenders = {category: items.append for category, items in categorized.items()}
+    # Default uncategorized items to meat
+    appenders[None] = appenders['meat']
+    classify = _classify
+    skip_label_search = _SKIP_LABEL_RE.search
+
+    current_marker_category = None
+
+    for dish in dishes:
+        # Strip and lowercase once; everything below works on dish_lower
+        dish_stripped = dish.strip() if dish else ''
+        if len(dish_stripped) < 3:
+            continue
+        dish_lower = dish_stripped.lower()
+
+        # Skip labels/headers, but only if it's a very short text (likely just the label)
+        if len(dish_lower) < 15 and skip_label_search(dish_lower):
+            continue
+
+        category, keyword_match = classify(dish_lower, current_marker_category)
+
+        # Check if this is a category marker
+        if category and category.startswith('marker:'):
+            current_marker_category = category.split(':')[1]
+            continue  # Don't add the marker itself
+
+        # Reset marker category if we encounter a dish without a clear category
+        # (meaning we've moved past the marked section)
+        if category and current_marker_category:
+            if category != current_marker_category:
+                # Only reset if it's clearly a different category
+                if keyword_match:
+                    current_marker_category = None
+
+        append = appenders.get(category)
+        if append is not None:
+            append(dish)
+
+    return categorized
+
+
+def merge_categories_for_display(categorized: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Merge categories for backward compatibility (fish + meat = meat).
+
+    Args:
+        categorized: Dict with vegetarian, meat, fish
+
+    Returns:
+        Dict with vegetarian and meat (fish merged into meat)
+    """
+    return {
+        'vegetarian': categorized.get('vegetarian', []),
+        'meat': [*categorized.get('meat', ()), *categorized.get('fish', ())]
     }
 
-    # Ingredient keywords for classification
-    FISH_KEYWORDS = [
-        'fisk', 'lax', 'torsk', 'sej', 'räkor', 'scampi', 'hummer', 'skaldjur',
-        'tonfisk', 'sill', 'strömming', 'gös', 'abborre', 'sardiner', 'makrill',
-        'hälleflundra', 'rödspätta', 'piggvar', 'havskräfta', 'kummel', 'fish'
-    ]
-
-    MEAT_KEYWORDS = [
-        'kött', 'kyckling', 'fläsk', 'biff', 'oxfilé', 'kalv', 'lamm', 'älg',
-        'ren', 'ankbröst', 'fågel', 'entrecote', 'ryggbiff', 'sidfläsk',
-        'bacon', 'chorizo', 'korv', 'köttbullar', 'hamburgare', 'schnitzel',
-        'frikadeller', 'pulled pork', 'revbensspjäll', 'korvstroganoff',
-        'wallenbergare', 'pytt i panna', 'raggmunk med fläsk', 'coq au vin',
-        'porchetta', 'färsbiff', 'kycklinglår', 'nötkött', 'fläskkarré'
-    ]
-
-    VEGETARIAN_KEYWORDS = [
-        'vego', 'vegan', 'vegetarisk', 'halloumi', 'falafel', 'tempeh',
-        'tofu', 'vegansk', 'vegetariskt', 'bönor', 'linser', 'quinoa',
-        'seitan', 'svampgryta', 'svampsås', 'svampsoppa', 'rotselleri', 'selleri',
-        'kikärtor', 'grönsaker', 'vegoburgare', 'vegoköttbullar', 'chili med bönor',
-        'böff ala lindström', 'gnocchi', 'zucchini', 'aubergine', 'moussaka på vegofärs',
-        'långbakad rotselleri', 'skogssvamp', 'tempura svamp', 'tortellini', 'ricotta',
-        'spenat'
-    ]
-
-    # Special Swedish dishes that should be classified as meat
-    MEAT_DISHES = [
-        'ärtsoppa',  # Usually served with pork
-        'pannkaka'   # Context-dependent but traditionally with pork soup
-    ]
-
-    # Labels/headers to skip (not actual dishes)
-    SKIP_LABELS = [
-        'extra', 'övrig', 'övrigt', 'dessert', 'tillbehör'
-    ]
-
-    @classmethod
-    def classify_dish(cls, dish: str, previous_category: str = None) -> str:
-        """
-        Classify a single dish into vegetarian, meat, or fish.
-
-        Args:
-            dish: The dish text to classify
-            previous_category: If the dish follows a category marker, use this
-
-        Returns:
-            Category string: 'vegetarian', 'meat', or 'fish'
-        """
-        dish_lower = dish.lower().strip()
-
-        # Check if this is a category marker itself
-        # Only match if it's EXACTLY the marker or marker with trailing colon
-        for category, markers in cls.CATEGORY_MARKERS.items():
-            for marker in markers:
-                # Exact match or marker followed by colon
-                if dish_lower == marker or dish_lower == marker + ':':
-                    return f'marker:{category}'
-                # Also match if marker with colon at start (e.g., "Fisk: dagens rätt")
-                if dish_lower.startswith(marker + ':'):
-                    return f'marker:{category}'
-
-        # Check for explicit vegan/vegetarian markers first (highest priority)
-        # This catches dishes like "Ärtsoppa/Vegan" even if they contain meat keywords
-        # Also includes strong vegetable indicators to override "biff" in vegetable patties
-        explicit_veg_markers = ['vegan', 'vegansk', 'vegetarisk', 'vegetariskt', 'vego',
-                                'morot', 'morötter']
-        if any(marker in dish_lower for marker in explicit_veg_markers):
-            return 'vegetarian'
-
-        # Check for special meat dishes that should override category markers
-        # (e.g., "Ärtsoppa" after "Vegetariskt:" marker should still be meat)
-        if any(dish_name in dish_lower for dish_name in cls.MEAT_DISHES):
-            return 'meat'
-
-        # Check for meat keywords to avoid false positives
-        # (e.g., "fläsk" contains "fisk" as substring, but should be classified as meat)
-        if any(keyword in dish_lower for keyword in cls.MEAT_KEYWORDS):
-            return 'meat'
-
-        # Check for fish keywords
-        if any(keyword in dish_lower for keyword in cls.FISH_KEYWORDS):
-            return 'fish'
-
-        # Check for vegetarian keywords
-        if any(keyword in dish_lower for keyword in cls.VEGETARIAN_KEYWORDS):
-            return 'vegetarian'
-
-        # If previous line was a category marker, use that as fallback
-        # This comes AFTER keyword checks so that explicit dishes override markers
-        if previous_category:
-            return previous_category
-
-        # Default to meat if it looks like a dish (has serveras, med, etc.)
-        if any(word in dish_lower for word in ['serveras', ' med ', 'till', 'samt', 'och']):
-            return 'meat'
-
-        # If we can't determine, return None
-        return None
-
-    @classmethod
-    def classify_dishes(cls, dishes: List[str]) -> Dict[str, List[str]]:
-        """
-        Classify a list of dishes into categories.
-
-        Args:
-            dishes: List of dish strings to classify
-
-        Returns:
-            Dictionary with 'vegetarian', 'meat', and 'fish' categories
-        """
-        categorized = {
-            'vegetarian': [],
-            'meat': [],
-            'fish': []
-        }
-
-        current_marker_category = None
-
-        for dish in dishes:
-            if not dish or len(dish.strip()) < 3:
-                continue
-
-            # Skip labels/headers
-            dish_lower = dish.lower().strip()
-            if any(label in dish_lower for label in cls.SKIP_LABELS):
-                # Only skip if it's a very short text (likely just the label)
-                if len(dish_lower) < 15:
-                    continue
-
-            category = cls.classify_dish(dish, current_marker_category)
-
-            # Check if this is a category marker
-            if category and category.startswith('marker:'):
-                current_marker_category = category.split(':')[1]
-                continue  # Don't add the marker itself
-
-            # Reset marker category if we encounter a dish without a clear category
-            # (meaning we've moved past the marked section)
-            if category and current_marker_category:
-                if category != current_marker_category:
-                    # Only reset if it's clearly a different category
-                    if any(keyword in dish.lower() for keyword in
-                           cls.FISH_KEYWORDS + cls.MEAT_KEYWORDS + cls.VEGETARIAN_KEYWORDS):
-                        current_marker_category = None
-
-            if category and category in categorized:
-                categorized[category].append(dish)
-            elif category is None:
-                # Default uncategorized items to meat
-                categorized['meat'].append(dish)
-
-        return categorized
-
-    @classmethod
-    def merge_categories_for_display(cls, categorized: Dict[str, List[str]]) -> Dict[str, List[str]]:
-        """
-        Merge categories for backward compatibility (fish + meat = meat).
-
-        Args:
-            categorized: Dict with vegetarian, meat, fish
-
-        Returns:
-            Dict with vegetarian and meat (fish merged into meat)
-        """
-        return {
-            'vegetarian': categorized.get('vegetarian', []),
-            'meat': categorized.get('meat', []) + categorized.get('fish', [])
-        }
+
+class DishClassifier:
+    """
+    Classifier for categorizing dishes into vegetarian, meat, and fish.
+
+    Thin namespace over the module-level functions and constants, kept for
+    backward compatibility.
+    """
+
+    CATEGORY_MARKERS = CATEGORY_MARKERS
+    FISH_KEYWORDS = FISH_KEYWORDS
+    MEAT_KEYWORDS = MEAT_KEYWORDS
+    VEGETARIAN_KEYWORDS = VEGETARIAN_KEYWORDS
+    MEAT_DISHES = MEAT_DISHES
+    EXPLICIT_VEGETARIAN_MARKERS = EXPLICIT_VEGETARIAN_MARKERS
+    MEAT_HINT_WORDS = MEAT_HINT_WORDS
+    SKIP_LABELS = SKIP_LABELS
+
+    classify_dish = staticmethod(classify_dish)
+    classify_dishes = staticmethod(classify_dishes)
+    merge_categories_for_display = staticmethod(merge_categories_for_display)
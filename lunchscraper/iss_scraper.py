@@ -1,17 +1,111 @@
 """Web scraper for ISS restaurant menus."""
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Dict, List, Optional
 import logging
 import base64
 import json
-from .base_scraper import BaseMenuScraper
-from .dish_classifier import DishClassifier
+import re
+import requests
+import time
+from . import cache
+from .base_scraper import BaseMenuScraper, create_session
+from .dish_classifier import classify_dishes
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# The Wix page embeds its configuration (including the API auth token) here
+VIEWER_MODEL_STRAINER = SoupStrainer('script', id='wix-viewer-model')
+AUTH_TOKEN_RE = re.compile(r'"Authorization"\s*:\s*"([^"]+)"')
+
+# Dishes in the API's menu text are separated by newlines and/or tabs
+DISH_SEPARATOR_RE = re.compile(r'[\t\n]+')
+
+# Swedish day names in the order of the API's menuSwedish array (Monday first)
+DAY_NAMES = ('måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag')
+
+
+# How long an established session (auth token and cookies) is reused
+AUTH_CACHE_TTL = 60 * 60
+
+# Established sessions per restaurant URL, as (expires, auth) tuples. Backed by
+# the on-disk cache so that separate runs can reuse them too.
+_auth_store: Dict[str, tuple] = {}
+
+
+def _get_stored_auth(restaurant_url: str) -> Optional[dict]:
+    """Get a previously established session for a restaurant, if still fresh."""
+    entry = _auth_store.get(restaurant_url)
+    if entry and entry[0] > time.time():
+        return entry[1]
+
+    # Keep the disk entry's expiry, so the session isn't reused past its TTL
+    stored = cache.get_entry(('iss-auth', restaurant_url))
+    if stored is None:
+        return None
+    auth, expires = stored
+    if auth:
+        _auth_store[restaurant_url] = (expires, auth)
+    return auth
+
+
+def _store_auth(restaurant_url: str, auth: dict) -> None:
+    """Remember an established session for a restaurant."""
+    _auth_store[restaurant_url] = (time.time() + AUTH_CACHE_TTL, auth)
+    cache.put(('iss-auth', restaurant_url), auth, AUTH_CACHE_TTL)
+
+
+def _forget_auth(restaurant_url: str) -> None:
+    """Drop a stored session, e.g. after the API rejected it."""
+    _auth_store.pop(restaurant_url, None)
+    cache.delete(('iss-auth', restaurant_url))
+
+
+def _json_loads(data: str):
+    """Decode JSON with orjson when it's installed, otherwise the stdlib json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data) -> bytes:
+    """Encode JSON compactly as UTF-8 with orjson when it's installed, otherwise the stdlib json."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+@lru_cache(maxsize=64)
+def _encode_api_query(restaurant_id: str, app_id: str, week_number: int) -> str:
+    """Build the base64-encoded API query for a restaurant and week (memoized)."""
+    query_data = {
+        "dataCollectionId": "Meny",
+        "query": {
+            "filter": {
+                "restrauntId": restaurant_id,  # Note: misspelled in API
+                "weekNumber": week_number
+            },
+            "paging": {
+                "offset": 0,
+                "limit": 1
+            },
+            "fields": []
+        },
+        "referencedItemOptions": [],
+        "returnTotalCount": True,
+        "environment": "LIVE",
+        "appId": app_id
+    }
+
+    return base64.urlsafe_b64encode(_json_dumps(query_data)).decode('ascii')
+
 
 class ISSMenuScraper(BaseMenuScraper):
     """Scraper for ISS restaurant lunch menus."""
@@ -20,22 +114,28 @@ class ISSMenuScraper(BaseMenuScraper):
         super().__init__(restaurant_name)
         self.restaurant_url = restaurant_url
         self.restaurant_id = restaurant_id
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,sv;q=0.8',
-        })
+        self.session = create_session()
         self.api_base_url = 'https://www.iss-menyer.se/_api/cloud-data/v2/items/query'
         self.app_id = '16d45e35-d3d8-4d5e-b24d-2a680b7e5089'
         self._session_established = False
         self._meta_site_id = '5e5cfbed-93b8-4425-8938-b96c735bd6c1'  # Meta Site ID for iss-menyer.se
         self._auth_token = None
+        self._session_reused = False
     
     def _establish_session(self):
         """Visit the main page to establish a browser session."""
         if self._session_established:
             return
+
+        # Reuse a session established by an earlier scraper or run
+        auth = _get_stored_auth(self.restaurant_url)
+        if auth:
+            logger.debug("Reusing stored session")
+            self._auth_token = auth['token']
+            self.session.cookies.update(auth['cookies'])
+            self._session_established = True
+            self._session_reused = True
+            return
         
         # First visit the home page to establish session
         logger.debug("Establishing session by visiting home page")
@@ -54,67 +154,62 @@ class ISSMenuScraper(BaseMenuScraper):
             response.raise_for_status()
             logger.debug(f"Session established. Status: {response.status_code}")
             
-            # Extract authorization token from HTML using BeautifulSoup
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            viewer_script = soup.find('script', {'id': 'wix-viewer-model'})
-            if viewer_script:
-                json_content = viewer_script.string
-                # Parse the JSON to find the authorization token
-                try:
-                    import json
-                    viewer_data = json.loads(json_content)
-                    # The token is in the headers of the dynamic pages configuration
-                    for prefix_data in viewer_data.get('siteFeaturesConfigs', {}).get('dynamicPages', {}).get('prefixToRouterFetchData', {}).values():
-                        if 'headers' in prefix_data.get('optionsData', {}):
-                            headers = prefix_data['optionsData']['headers']
-                            if 'Authorization' in headers:
-                                self._auth_token = headers['Authorization']
-                                logger.debug(f"Found auth token")
-                                break
-                except Exception as e:
-                    logger.warning(f"Could not parse viewer-model JSON: {e}")
+            # The token sits in the page as a quoted header value, so a regex
+            # scan usually finds it without parsing the page
+            match = AUTH_TOKEN_RE.search(response.text)
+            if match:
+                self._auth_token = match.group(1)
+                logger.debug(f"Found auth token")
             else:
-                logger.warning("Could not find wix-viewer-model script tag")
-            
+                self._auth_token = self._extract_auth_token(response.text)
+
             self._session_established = True
+            if self._auth_token:
+                _store_auth(self.restaurant_url, {
+                    'token': self._auth_token,
+                    'cookies': self.session.cookies.get_dict(),
+                })
         except Exception as e:
             logger.warning(f"Failed to establish session: {e}")
             # Don't raise, we'll try the API anyway
     
+    def _extract_auth_token(self, html: str) -> Optional[str]:
+        """Extract the API authorization token from the page's viewer-model JSON."""
+        # Only build the viewer-model script element
+        soup = BeautifulSoup(html, 'lxml', parse_only=VIEWER_MODEL_STRAINER)
+        viewer_script = soup.find('script', {'id': 'wix-viewer-model'})
+        if not viewer_script:
+            logger.warning("Could not find wix-viewer-model script tag")
+            return None
+
+        # Parse the JSON to find the authorization token
+        try:
+            viewer_data = _json_loads(str(viewer_script.string))
+            # The token is in the headers of the dynamic pages configuration
+            for prefix_data in viewer_data.get('siteFeaturesConfigs', {}).get('dynamicPages', {}).get('prefixToRouterFetchData', {}).values():
+                headers = prefix_data.get('optionsData', {}).get('headers', {})
+                if 'Authorization' in headers:
+                    logger.debug(f"Found auth token")
+                    return headers['Authorization']
+        except Exception as e:
+            logger.warning(f"Could not parse viewer-model JSON: {e}")
+        return None
+
     def _get_week_number(self, target_date: date) -> int:
         """Get ISO week number for a given date."""
         return target_date.isocalendar()[1]
     
     def _build_api_query(self, week_number: int) -> str:
         """Build the API query parameter."""
-        query_data = {
-            "dataCollectionId": "Meny",
-            "query": {
-                "filter": {
-                    "restrauntId": self.restaurant_id,  # Note: misspelled in API
-                    "weekNumber": week_number
-                },
-                "paging": {
-                    "offset": 0,
-                    "limit": 1
-                },
-                "fields": []
-            },
-            "referencedItemOptions": [],
-            "returnTotalCount": True,
-            "environment": "LIVE",
-            "appId": self.app_id
-        }
-        
-        # Encode to base64
-        json_str = json.dumps(query_data, separators=(',', ':'))
-        encoded = base64.urlsafe_b64encode(json_str.encode('utf-8')).decode('utf-8')
-        
-        return encoded
+        return _encode_api_query(self.restaurant_id, self.app_id, week_number)
     
-    def _fetch_menu_from_api(self, week_number: int) -> dict:
-        """Fetch menu data from the ISS API."""
+    def _fetch_menu_from_api(self, week_number: int, retry_on_expired_session: bool = True) -> dict:
+        """
+        Fetch menu data from the ISS API.
+
+        If the API rejects a session reused from an earlier run, a new session
+        is established and the request is retried once.
+        """
         # First establish a session by visiting the main page
         self._establish_session()
         
@@ -142,14 +237,25 @@ class ISSMenuScraper(BaseMenuScraper):
         logger.debug(f"API URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=10)
-            if response.status_code != 200:
-                logger.debug(f"API error response: {response.text}")
-            response.raise_for_status()
-            data = response.json()
+            data = _json_loads(cache.fetch_text(self.session, url, timeout=10))
             logger.debug(f"API response received successfully")
             return data
         except Exception as e:
+            rejected = (isinstance(e, requests.HTTPError) and e.response is not None
+                        and e.response.status_code in (401, 403))
+            if rejected:
+                # The stored session has expired, so establish a new one next time.
+                # Other errors (timeouts, server errors) leave it to be reused.
+                _forget_auth(self.restaurant_url)
+
+            if rejected and self._session_reused and retry_on_expired_session:
+                logger.debug("Stored session was rejected, establishing a new one")
+                self._session_established = False
+                self._session_reused = False
+                self._auth_token = None
+                self.session.headers.pop('Authorization', None)
+                return self._fetch_menu_from_api(week_number, retry_on_expired_session=False)
+
             raise Exception(f"Failed to fetch menu from API: {e}")
     
     def _parse_api_response(self, api_data: dict) -> Dict[str, Dict[str, List[str]]]:
@@ -176,14 +282,8 @@ class ISSMenuScraper(BaseMenuScraper):
         if not menu_swedish:
             raise Exception("No menuSwedish data found in API response")
         
-        # Map Swedish day names to the menu array indices
-        day_names = ['måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag']
-        
-        for idx, day_menu_obj in enumerate(menu_swedish):
-            if idx >= len(day_names):
-                break
-            
-            day_name = day_names[idx]
+        # Days are positional, Monday first; zip stops after Sunday
+        for day_name, day_menu_obj in zip(DAY_NAMES, menu_swedish):
             menu_text = day_menu_obj.get('menu', '').strip()
             
             if not menu_text:
@@ -207,24 +307,10 @@ class ISSMenuScraper(BaseMenuScraper):
             return {'vegetarian': [], 'fish': [], 'meat': []}
 
         # Split by newlines and tabs to get all parts
-        dishes = []
-        lines = menu_text.split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Split by tabs
-            parts = line.split('\t')
-
-            for part in parts:
-                part = part.strip()
-                if part:
-                    dishes.append(part)
+        dishes = [part for part in map(str.strip, DISH_SEPARATOR_RE.split(menu_text)) if part]
 
         # Use classifier to categorize dishes
-        categorized = DishClassifier.classify_dishes(dishes)
+        categorized = classify_dishes(dishes)
 
         # Return all three categories
         return categorized
@@ -257,13 +343,11 @@ class ISSMenuScraper(BaseMenuScraper):
         
         # Get the day of week (0=Monday, 6=Sunday)
         day_of_week = target_date.weekday()
-        day_names = ['måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag']
-        
-        if day_of_week >= len(day_names):
+        if day_of_week >= len(DAY_NAMES):
             logger.warning(f"Invalid day of week: {day_of_week}")
             return {'vegetarian': [], 'meat': []}
         
-        day_name = day_names[day_of_week]
+        day_name = DAY_NAMES[day_of_week]
         logger.debug(f"Looking for menu for day: {day_name} (day of week: {day_of_week})")
         logger.debug(f"Available days in menu: {list(weekly_menu.keys())}")
         
@@ -1,16 +1,60 @@
 """Web scraper for Kvartersmenyn restaurant menus."""
 
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, date
 from typing import Dict, List, Optional
 import re
 import logging
-from .base_scraper import BaseMenuScraper
-from .dish_classifier import DishClassifier
+import lxml.html
+from lxml import etree
+from . import cache
+from .base_scraper import BaseMenuScraper, create_session
+from .dish_classifier import classify_dishes
 
 logger = logging.getLogger(__name__)
 
+# Climate rating letter that starts each dish (e.g. "B. Fiskgryta" or "B Fiskgryta")
+_CLIMATE_RATING_RE = re.compile(r'^[A-E]\.?\s+')
+# Allergen/dietary codes wrapped in underscores
+_ALLERGEN_CODE_RE = re.compile(r'_[a-z]+_')
+# Text that marks a line as page metadata rather than a dish
+_METADATA_RE = re.compile('|'.join(map(re.escape, [
+    'Klimato', 'CO2e-data', 'PRIS:', 'Öppet:', 'Veckans', 'VEGO HELA VECKAN'])))
+
+DAY_NAMES = ('måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag')
+# Day headers as they appear on the page, mapped to their menu keys
+_DAY_HEADERS = {day.capitalize(): day for day in DAY_NAMES}
+# Headers after the days that end the weekly menu (besides "Veckans ...")
+_END_OF_MENU_HEADERS = frozenset({'Klimato', 'VEGO HELA VECKAN', 'Sugen på vegetariskt?'})
+
+# Pages are decoded to text before parsing, so they are parsed back from UTF-8
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8', collect_ids=False, remove_blank_text=True)
+# Where a "meny" class token could end, to skip parsing pages without one. The
+# site name "kvartersmenyn" is on every page, so "meny" alone isn't enough.
+_MENU_CLASS_RE = re.compile(r'''meny[\s"'/>]''')
+# The first div with a "meny" class holds the weekly menu
+_MENU_DIV_XPATH = etree.XPath("(//div[contains(concat(' ', normalize-space(@class), ' '), ' meny ')])[1]")
+# Elements whose text isn't part of the menu: <i> tags hold invisible codes, and
+# the rest isn't visible text either
+_HIDDEN_ELEMENTS = ('i', 'script', 'style', 'template', 'rt', 'rp',
+                    etree.Comment, etree.ProcessingInstruction)
+
+
+def _parse_html(html: str) -> Optional[etree._Element]:
+    """Parse an HTML page, returning its root element (None for an empty page)."""
+    return etree.fromstring(html.encode('utf-8'), _HTML_PARSER)
+
+
+def _iter_text(element: etree._Element):
+    """Yield the text nodes inside an element in document order, skipping hidden elements."""
+    if element.text:
+        yield element.text
+    for child in element:
+        if child.tag not in _HIDDEN_ELEMENTS:
+            yield from _iter_text(child)
+        # The text after a hidden element is still visible
+        if child.tail:
+            yield child.tail
+
 
 class KvartersmenynsMenuScraper(BaseMenuScraper):
     """Scraper for Kvartersmenyn restaurant lunch menus."""
@@ -18,47 +62,40 @@ class KvartersmenynsMenuScraper(BaseMenuScraper):
     def __init__(self, restaurant_url: str, restaurant_name: str):
         super().__init__(restaurant_name)
         self.restaurant_url = restaurant_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,sv;q=0.8',
-        })
-
-    def _fetch_page(self) -> BeautifulSoup:
-        """Fetch the restaurant page and return BeautifulSoup object."""
+        self.session = create_session()
+
+    def _fetch_page(self) -> Optional[etree._Element]:
+        """Fetch the restaurant page and return its parsed root element (None if it has no menu)."""
         logger.debug(f"Fetching menu from {self.restaurant_url}")
         try:
-            response = self.session.get(self.restaurant_url, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            html = cache.fetch_text(self.session, self.restaurant_url, timeout=10)
+            # A page without the "meny" class anywhere can't hold a menu, so don't parse it
+            if not _MENU_CLASS_RE.search(html):
+                return None
+            return _parse_html(html)
         except Exception as e:
             raise Exception(f"Failed to fetch menu page: {e}")
 
-    def _parse_weekly_menu(self, soup: BeautifulSoup) -> Dict[str, Dict[str, List[str]]]:
-        """Parse the weekly menu from the page."""
+    def _parse_weekly_menu(self, root: Optional[etree._Element]) -> Dict[str, Dict[str, List[str]]]:
+        """Parse the weekly menu from the page's root element."""
         weekly_menu = {}
 
         # Find the menu div
-        menu_div = soup.find('div', class_='meny')
-        if not menu_div:
+        menu_divs = _MENU_DIV_XPATH(root) if root is not None else []
+        if not menu_divs:
             logger.warning("Could not find menu div")
             return weekly_menu
+        menu_div = menu_divs[0]
 
-        # Remove invisible <i> tags that contain codes
-        for i_tag in menu_div.find_all('i'):
-            i_tag.decompose()
-
-        # Get all text content from the div, using get_text with separator
-        full_text = menu_div.get_text(separator='\n')
-
-        # Split into lines and process
-        day_names = ['Måndag', 'Tisdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lördag', 'Söndag']
+        # Walk the text nodes of the div line by line, rather than joining
+        # them into one string and splitting it again
+        lines = (line for text in _iter_text(menu_div) for line in text.split('\n'))
 
-        current_day = None
-        current_dishes = []
+        # Collect the lines of each day first, then parse the days
+        days = []
+        current_dishes = None
 
-        for line in full_text.split('\n'):
+        for line in lines:
             line = line.strip()
 
             # Skip empty lines
@@ -66,38 +103,27 @@ class KvartersmenynsMenuScraper(BaseMenuScraper):
                 continue
 
             # Check if this is a day header
-            if line in day_names:
-                # Save previous day if we have one
-                if current_day and current_dishes:
-                    menu_items = self._parse_dishes(current_dishes)
-                    if menu_items['vegetarian'] or menu_items['fish'] or menu_items['meat']:
-                        weekly_menu[current_day.lower()] = menu_items
-                        logger.debug(f"Parsed {current_day}: {len(menu_items['vegetarian'])} veg, {len(menu_items['fish'])} fish, {len(menu_items['meat'])} meat")
-
+            day = _DAY_HEADERS.get(line)
+            if day:
                 # Start new day
-                current_day = line
                 current_dishes = []
+                days.append((day, current_dishes))
 
             # Check if we've hit a non-day header (like "Veckans salladsbowl" or "Klimato")
-            elif current_day and (line.startswith('Veckans') or line in ['Klimato', 'VEGO HELA VECKAN', 'Sugen på vegetariskt?']):
-                # Save current day and stop parsing
-                if current_dishes:
-                    menu_items = self._parse_dishes(current_dishes)
-                    if menu_items['vegetarian'] or menu_items['fish'] or menu_items['meat']:
-                        weekly_menu[current_day.lower()] = menu_items
-                        logger.debug(f"Parsed {current_day}: {len(menu_items['vegetarian'])} veg, {len(menu_items['fish'])} fish, {len(menu_items['meat'])} meat")
+            elif current_dishes is not None and (line.startswith('Veckans') or line in _END_OF_MENU_HEADERS):
                 break
 
             # Add line to current day
-            elif current_day:
+            elif current_dishes is not None:
                 current_dishes.append(line)
 
-        # Don't forget the last day
-        if current_day and current_dishes:
-            menu_items = self._parse_dishes(current_dishes)
+        for day, dishes in days:
+            if not dishes:
+                continue
+            menu_items = self._parse_dishes(dishes)
             if menu_items['vegetarian'] or menu_items['fish'] or menu_items['meat']:
-                weekly_menu[current_day.lower()] = menu_items
-                logger.debug(f"Parsed {current_day}: {len(menu_items['vegetarian'])} veg, {len(menu_items['fish'])} fish, {len(menu_items['meat'])} meat")
+                weekly_menu[day] = menu_items
+                logger.debug(f"Parsed {day}: {len(menu_items['vegetarian'])} veg, {len(menu_items['fish'])} fish, {len(menu_items['meat'])} meat")
 
         return weekly_menu
 
@@ -118,7 +144,7 @@ class KvartersmenynsMenuScraper(BaseMenuScraper):
                 continue
 
             # Check if this starts a new dish (has climate rating letter at start)
-            if re.match(r'^[A-E]\.?\s+', line):
+            if _CLIMATE_RATING_RE.match(line):
                 # Save previous dish
                 if current_dish:
                     combined_dishes.append(' '.join(current_dish))
@@ -140,23 +166,23 @@ class KvartersmenynsMenuScraper(BaseMenuScraper):
         cleaned_dishes = []
         for dish in combined_dishes:
             # Skip metadata lines
-            if any(skip in dish for skip in ['Klimato', 'CO2e-data', 'PRIS:', 'Öppet:', 'Veckans', 'VEGO HELA VECKAN']):
+            if _METADATA_RE.search(dish):
                 continue
 
             # Remove allergen/dietary codes
-            dish = re.sub(r'_[a-z]+_', '', dish)
+            dish = _ALLERGEN_CODE_RE.sub('', dish)
 
             # Remove climate rating at start
-            dish = re.sub(r'^[A-E]\.?\s+', '', dish)
+            dish = _CLIMATE_RATING_RE.sub('', dish)
 
             # Remove multiple spaces
-            dish = re.sub(r'\s+', ' ', dish).strip()
+            dish = ' '.join(dish.split())
 
             if dish and len(dish) >= 5:
                 cleaned_dishes.append(dish)
 
         # Use classifier to categorize dishes
-        categorized = DishClassifier.classify_dishes(cleaned_dishes)
+        categorized = classify_dishes(cleaned_dishes)
 
         # Return all three categories
         return categorized
@@ -177,20 +203,18 @@ class KvartersmenynsMenuScraper(BaseMenuScraper):
         logger.debug(f"Fetching menu for date: {target_date} ({target_date.strftime('%A, %B %d, %Y')})")
 
         try:
-            soup = self._fetch_page()
-            weekly_menu = self._parse_weekly_menu(soup)
+            root = self._fetch_page()
+            weekly_menu = self._parse_weekly_menu(root)
         except Exception as e:
             raise Exception(f"Failed to fetch menu: {e}")
 
         # Get the day of week (0=Monday, 6=Sunday)
         day_of_week = target_date.weekday()
-        day_names = ['måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag']
-
-        if day_of_week >= len(day_names):
+        if day_of_week >= len(DAY_NAMES):
             logger.warning(f"Invalid day of week: {day_of_week}")
             return {'vegetarian': [], 'meat': []}
 
-        day_name = day_names[day_of_week]
+        day_name = DAY_NAMES[day_of_week]
         logger.debug(f"Looking for menu for day: {day_name}")
 
         if day_name not in weekly_menu:
@@ -208,8 +232,8 @@ class KvartersmenynsMenuScraper(BaseMenuScraper):
         logger.debug(f"Fetching weekly menu for {self.restaurant_name}")
 
         try:
-            soup = self._fetch_page()
-            weekly_menu = self._parse_weekly_menu(soup)
+            root = self._fetch_page()
+            weekly_menu = self._parse_weekly_menu(root)
         except Exception as e:
             raise Exception(f"Failed to fetch menu: {e}")
 
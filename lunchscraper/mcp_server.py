@@ -1,11 +1,57 @@
 """MCP Server for RHLunch - Expose lunch menu functionality to AI assistants."""
 
-from datetime import date, datetime
-from typing import Optional, List, Dict, Any
-from mcp.server.fastmcp import FastMCP
-
-from .iss_scraper import ISSMenuScraper
-from .kvartersmenyn_scraper import KvartersmenynsMenuScraper
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date
+from typing import Optional, List, Dict, Any, Sequence
+import requests
+from mcp.server.fastmcp import Context, FastMCP
+
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+# How long fetched menus are kept in memory (seconds), overridable with
+# $RHLUNCH_CACHE_TTL. Entries never outlive the next morning's menu update.
+MENU_CACHE_TTL = 60 * 60
+
+_menu_cache: Dict[tuple, tuple] = {}
+_menu_cache_lock = threading.Lock()
+
+# Scrapers are kept for the life of the server so their HTTP sessions (and
+# kept-alive connections) are reused across tool calls. Each one comes with a
+# lock, since a scraper keeps session state that concurrent fetches would race on.
+_scrapers: Dict[str, tuple] = {}
+_scrapers_lock = threading.Lock()
+
+SEPARATOR = "─" * 50
+
+# The target_date format, checked before parsing since date.fromisoformat also
+# takes other ISO 8601 forms (e.g. 20251104 or 2025-W45-2)
+TARGET_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+# Menu categories with their section headings, in display order
+SECTION_HEADINGS = (
+    ('vegetarian', "\n🥬 Vegetarian:"),
+    ('fish', "\n🐟 Fish:"),
+    ('meat', "\n🥩 Meat:"),
+)
+
+# Swedish weekly menu keys indexed by date.weekday()
+SWEDISH_WEEKDAYS = ('måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag')
+
+# Swedish weekly menu keys with their English names, in display order
+DAY_NAMES = (
+    ('måndag', 'Monday'),
+    ('tisdag', 'Tuesday'),
+    ('onsdag', 'Wednesday'),
+    ('torsdag', 'Thursday'),
+    ('fredag', 'Friday'),
+)
 
 # Initialize FastMCP server
 mcp = FastMCP("RHLunch")
@@ -29,21 +75,29 @@ RESTAURANTS = {
         'url': 'https://karavan.kvartersmenyn.se/'
     }
 }
+ALL_RESTAURANT_KEYS = tuple(RESTAURANTS)
 
 
 def _create_scraper(restaurant_key: str):
-    """Create appropriate scraper for the given restaurant."""
+    """
+    Create appropriate scraper for the given restaurant.
+
+    Scraper modules are imported on first use so that the server can answer
+    the MCP handshake without waiting for bs4/lxml to load.
+    """
     config = RESTAURANTS.get(restaurant_key)
     if not config:
         raise ValueError(f"Unknown restaurant: {restaurant_key}")
 
     if config['type'] == 'iss':
+        from .iss_scraper import ISSMenuScraper
         return ISSMenuScraper(
             restaurant_url=config['url'],
             restaurant_id=config['id'],
             restaurant_name=config['name']
         )
     elif config['type'] == 'kvartersmenyn':
+        from .kvartersmenyn_scraper import KvartersmenynsMenuScraper
         return KvartersmenynsMenuScraper(
             restaurant_url=config['url'],
             restaurant_name=config['name']
@@ -52,45 +106,197 @@ def _create_scraper(restaurant_key: str):
         raise ValueError(f"Unknown restaurant type: {config['type']}")
 
 
-def _filter_menu(menu: Dict[str, List[str]],
-                 vegetarian_only: bool = False,
-                 fish_only: bool = False,
-                 meat_only: bool = False) -> Dict[str, List[str]]:
-    """Filter menu based on dietary preferences."""
+def _get_scraper(restaurant_key: str) -> tuple:
+    """
+    Get the shared scraper for the given restaurant, creating it on first use.
+
+    Returns:
+        (scraper, lock) tuple. Hold the lock while using the scraper.
+    """
+    with _scrapers_lock:
+        entry = _scrapers.get(restaurant_key)
+        if entry is None:
+            entry = _scrapers[restaurant_key] = (_create_scraper(restaurant_key), threading.Lock())
+        return entry
+
+
+def _scrape(restaurant_key: str, fetch):
+    """Call fetch(scraper) with the restaurant's shared scraper, one call at a time."""
+    scraper, lock = _get_scraper(restaurant_key)
+    with lock:
+        return fetch(scraper)
+
+
+def _select_sections(vegetarian_only: bool = False,
+                     fish_only: bool = False,
+                     meat_only: bool = False) -> tuple:
+    """Get the menu sections to show based on dietary preferences."""
     if vegetarian_only:
-        return {'vegetarian': menu.get('vegetarian', [])}
+        return SECTION_HEADINGS[0:1]
     elif fish_only:
-        return {'fish': menu.get('fish', [])}
+        return SECTION_HEADINGS[1:2]
     elif meat_only:
-        return {'meat': menu.get('meat', [])}
-    return menu
+        return SECTION_HEADINGS[2:3]
+    return SECTION_HEADINGS
 
 
-def _format_menu_text(restaurant_name: str, menu: Dict[str, List[str]]) -> str:
-    """Format menu as readable text."""
-    lines = [f"\n📍 {restaurant_name}", "─" * 50]
-
-    if menu.get('vegetarian'):
-        lines.append("\n🥬 Vegetarian:")
-        for item in menu['vegetarian']:
-            lines.append(f"  • {item}")
+def _append_sections(out: List[str], menu: Dict[str, List[str]],
+                     sections: tuple = SECTION_HEADINGS) -> bool:
+    """
+    Append the category sections of a menu to the output lines.
 
-    if menu.get('fish'):
-        lines.append("\n🐟 Fish:")
-        for item in menu['fish']:
-            lines.append(f"  • {item}")
+    Args:
+        out: List of output lines to append to
+        menu: Dict with 'vegetarian', 'fish' and 'meat' lists of dishes
+        sections: (category, heading) pairs to show, from _select_sections
 
-    if menu.get('meat'):
-        lines.append("\n🥩 Meat:")
-        for item in menu['meat']:
-            lines.append(f"  • {item}")
+    Returns:
+        True if any dishes were shown.
+    """
+    has_items = False
+    for category, heading in sections:
+        items = menu.get(category)
+        if items:
+            has_items = True
+            out.append(heading)
+            out.extend(f"  • {item}" for item in items)
+    return has_items
+
+
+def _format_menu_text(restaurant_name: str, menu: Dict[str, List[str]],
+                      sections: tuple = SECTION_HEADINGS) -> str:
+    """Format menu as readable text."""
+    lines = [f"\n📍 {restaurant_name}", SEPARATOR]
 
-    if not any(menu.values()):
+    if not _append_sections(lines, menu, sections):
         lines.append("\n❌ No menu available")
 
     return "\n".join(lines)
 
 
+def _menu_cache_ttl() -> float:
+    """Get the menu cache TTL, cut off at the next menu update time."""
+    try:
+        ttl = float(os.environ.get('RHLUNCH_CACHE_TTL', MENU_CACHE_TTL))
+    except ValueError:
+        ttl = MENU_CACHE_TTL
+    return cache.menu_ttl(ttl)
+
+
+def _cached(cache_key: tuple, fetch):
+    """
+    Return the cached value for cache_key, calling fetch() on a miss.
+
+    Values are kept in memory and in the on-disk menu cache (shared with the
+    CLI), so a restarted server doesn't have to scrape every site again. A
+    value read from disk is kept in memory no longer than its disk entry
+    lives, and a value built from a stored page while the site was down
+    isn't cached.
+    """
+    with _menu_cache_lock:
+        entry = _menu_cache.get(cache_key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    ttl = _menu_cache_ttl()
+    stored = cache.get_entry(cache_key)
+    if stored is not None:
+        value, expires = stored
+        ttl = min(ttl, expires - time.time())
+    else:
+        cache.reset_fallback()
+        value = fetch()
+        if cache.used_fallback():
+            return value
+        cache.put(cache_key, value, ttl)
+
+    with _menu_cache_lock:
+        _menu_cache[cache_key] = (time.monotonic() + ttl, value)
+    return value
+
+
+def _fetch_daily_menu(restaurant_key: str, menu_date: date) -> Dict[str, List[str]]:
+    """
+    Fetch one restaurant's menu for a day (blocking, cached).
+
+    Days in the current week are taken from the cached weekly menu, so asking
+    for today's and tomorrow's menu only scrapes the restaurant once.
+    """
+    iso_year, iso_week, _ = menu_date.isocalendar()
+    if (iso_year, iso_week) == date.today().isocalendar()[:2]:
+        day_name = SWEDISH_WEEKDAYS[menu_date.weekday()]
+        weekly_menu = _fetch_weekly_menu(restaurant_key)
+        if day_name not in weekly_menu:
+            raise Exception(f"No menu found for {day_name}")
+        return weekly_menu[day_name]
+
+    return _cached(
+        (restaurant_key, iso_year, iso_week, menu_date.isoformat()),
+        lambda: _scrape(restaurant_key, lambda scraper: scraper.get_menu_for_day(menu_date))
+    )
+
+
+def _fetch_weekly_menu(restaurant_key: str) -> Dict[str, Dict[str, List[str]]]:
+    """Fetch one restaurant's weekly menu (blocking, cached)."""
+    iso_year, iso_week, _ = date.today().isocalendar()
+    return _cached(
+        (restaurant_key, iso_year, iso_week, 'week'),
+        lambda: _scrape(restaurant_key, lambda scraper: scraper.get_weekly_menu())
+    )
+
+
+def _error_message(error: BaseException) -> str:
+    """
+    Get a short description of a failed fetch for the tool output.
+
+    Network errors (wrapped by the scrapers) are reported as one short phrase
+    instead of the full requests message with URLs and retry details.
+    """
+    cause = error
+    while cause is not None:
+        if isinstance(cause, requests.Timeout):
+            return "Request timed out"
+        if isinstance(cause, requests.ConnectionError):
+            return "Connection failed"
+        cause = cause.__cause__ or cause.__context__
+    return str(error)
+
+
+async def _gather_in_threads(func, restaurant_keys: Sequence[str], *args,
+                             ctx: Optional[Context] = None) -> List[Any]:
+    """
+    Run a blocking fetch for several restaurants concurrently.
+
+    Each call runs in a worker thread, so the total time is that of the
+    slowest restaurant rather than the sum. If a tool context is given,
+    progress is reported to the client as each restaurant finishes.
+
+    Returns:
+        One result (or the raised exception) per restaurant key, in order.
+    """
+    completed = 0
+
+    async def fetch(key):
+        nonlocal completed
+        try:
+            result = await asyncio.to_thread(func, key, *args)
+        except Exception as e:
+            result = e
+
+        completed += 1
+        if ctx is not None:
+            # Progress is only informational, so a failed notification
+            # mustn't replace the menu (or the fetch error)
+            try:
+                await ctx.report_progress(completed, len(restaurant_keys),
+                                          f"Fetched {RESTAURANTS[key]['name']}")
+            except Exception as e:
+                logger.debug(f"Could not report progress for {key}: {e}")
+        return result
+
+    return await asyncio.gather(*(fetch(key) for key in restaurant_keys))
+
+
 @mcp.tool()
 def list_restaurants() -> str:
     """List all available restaurants.
@@ -105,12 +311,13 @@ def list_restaurants() -> str:
 
 
 @mcp.tool()
-def get_daily_menu(
+async def get_daily_menu(
     restaurant: Optional[str] = None,
     vegetarian_only: bool = False,
     fish_only: bool = False,
     meat_only: bool = False,
-    target_date: Optional[str] = None
+    target_date: Optional[str] = None,
+    ctx: Context = None
 ) -> str:
     """Get today's lunch menu from one or all restaurants.
 
@@ -128,41 +335,45 @@ def get_daily_menu(
     menu_date = date.today()
     if target_date:
         try:
-            menu_date = datetime.strptime(target_date, '%Y-%m-%d').date()
+            if not TARGET_DATE_RE.fullmatch(target_date):
+                raise ValueError(target_date)
+            menu_date = date.fromisoformat(target_date)
         except ValueError:
             return f"Error: Invalid date format. Use YYYY-MM-DD. Example: 2025-11-04"
 
     # Determine which restaurants to query
-    restaurant_keys = [restaurant] if restaurant else list(RESTAURANTS.keys())
+    restaurant_keys = (restaurant,) if restaurant else ALL_RESTAURANT_KEYS
 
     # Validate restaurant key
-    for key in restaurant_keys:
-        if key not in RESTAURANTS:
-            return f"Error: Unknown restaurant '{key}'. Use list_restaurants() to see available options."
+    if restaurant and restaurant not in RESTAURANTS:
+        return f"Error: Unknown restaurant '{restaurant}'. Use list_restaurants() to see available options."
 
     # Build result
     result = [f"🍽️ Lunch Menu for {menu_date.strftime('%A, %B %d, %Y')}\n"]
 
-    for key in restaurant_keys:
-        try:
-            scraper = _create_scraper(key)
-            menu = scraper.get_menu_for_day(menu_date)
-            filtered_menu = _filter_menu(menu, vegetarian_only, fish_only, meat_only)
-            result.append(_format_menu_text(RESTAURANTS[key]['name'], filtered_menu))
-        except Exception as e:
+    sections = _select_sections(vegetarian_only, fish_only, meat_only)
+    menus = await _gather_in_threads(_fetch_daily_menu, restaurant_keys, menu_date, ctx=ctx)
+
+    for key, menu in zip(restaurant_keys, menus):
+        if isinstance(menu, Exception):
             result.append(f"\n📍 {RESTAURANTS[key]['name']}")
-            result.append("─" * 50)
-            result.append(f"\n❌ Error: {str(e)}")
+            result.append(SEPARATOR)
+            logger.warning(f"Failed to fetch menu for {key}", exc_info=menu)
+            result.append(f"\n❌ Error: {_error_message(menu)}")
+            continue
+
+        result.append(_format_menu_text(RESTAURANTS[key]['name'], menu, sections))
 
     return "\n".join(result)
 
 
 @mcp.tool()
-def get_weekly_menu(
+async def get_weekly_menu(
     restaurant: Optional[str] = None,
     vegetarian_only: bool = False,
     fish_only: bool = False,
-    meat_only: bool = False
+    meat_only: bool = False,
+    ctx: Context = None
 ) -> str:
     """Get the weekly lunch menu from one or all restaurants.
 
@@ -176,70 +387,55 @@ def get_weekly_menu(
         Formatted weekly menu text
     """
     # Determine which restaurants to query
-    restaurant_keys = [restaurant] if restaurant else list(RESTAURANTS.keys())
+    restaurant_keys = (restaurant,) if restaurant else ALL_RESTAURANT_KEYS
 
     # Validate restaurant key
-    for key in restaurant_keys:
-        if key not in RESTAURANTS:
-            return f"Error: Unknown restaurant '{key}'. Use list_restaurants() to see available options."
+    if restaurant and restaurant not in RESTAURANTS:
+        return f"Error: Unknown restaurant '{restaurant}'. Use list_restaurants() to see available options."
 
     # Build result
     result = ["🍽️ Weekly Lunch Menu\n"]
 
-    for key in restaurant_keys:
-        try:
-            scraper = _create_scraper(key)
-            weekly_menu = scraper.get_weekly_menu()
+    sections = _select_sections(vegetarian_only, fish_only, meat_only)
+    weekly_menus = await _gather_in_threads(_fetch_weekly_menu, restaurant_keys, ctx=ctx)
 
+    for key, weekly_menu in zip(restaurant_keys, weekly_menus):
+        if isinstance(weekly_menu, Exception):
             result.append(f"\n📍 {RESTAURANTS[key]['name']}")
-            result.append("─" * 50)
-
-            day_names = {
-                'måndag': 'Monday',
-                'tisdag': 'Tuesday',
-                'onsdag': 'Wednesday',
-                'torsdag': 'Thursday',
-                'fredag': 'Friday'
-            }
-
-            for swedish_day, english_day in day_names.items():
-                if swedish_day not in weekly_menu:
-                    continue
-
-                menu = weekly_menu[swedish_day]
-                filtered_menu = _filter_menu(menu, vegetarian_only, fish_only, meat_only)
+            result.append(SEPARATOR)
+            logger.warning(f"Failed to fetch menu for {key}", exc_info=weekly_menu)
+            result.append(f"\n❌ Error: {_error_message(weekly_menu)}")
+            continue
 
-                result.append(f"\n📅 {english_day}")
+        result.append(f"\n📍 {RESTAURANTS[key]['name']}")
+        result.append(SEPARATOR)
 
-                if filtered_menu.get('vegetarian'):
-                    result.append("\n🥬 Vegetarian:")
-                    for item in filtered_menu['vegetarian']:
-                        result.append(f"  • {item}")
+        for swedish_day, english_day in DAY_NAMES:
+            if swedish_day not in weekly_menu:
+                continue
 
-                if filtered_menu.get('fish'):
-                    result.append("\n🐟 Fish:")
-                    for item in filtered_menu['fish']:
-                        result.append(f"  • {item}")
+            result.append(f"\n📅 {english_day}")
 
-                if filtered_menu.get('meat'):
-                    result.append("\n🥩 Meat:")
-                    for item in filtered_menu['meat']:
-                        result.append(f"  • {item}")
-
-                if not any(filtered_menu.values()):
-                    result.append("  ❌ No menu available")
-
-        except Exception as e:
-            result.append(f"\n📍 {RESTAURANTS[key]['name']}")
-            result.append("─" * 50)
-            result.append(f"\n❌ Error: {str(e)}")
+            if not _append_sections(result, weekly_menu[swedish_day], sections):
+                result.append("  ❌ No menu available")
 
     return "\n".join(result)
 
 
 def main():
-    """Entry point for the MCP server."""
-    mcp.run()
+    """
+    Entry point for the MCP server.
+
+    Serves over stdio by default. Set $RHLUNCH_TRANSPORT to 'http' to serve
+    streamable HTTP instead, so several clients can share one server, on
+    $RHLUNCH_HOST:$RHLUNCH_PORT (default 127.0.0.1:8000).
+    """
+    transport = os.environ.get('RHLUNCH_TRANSPORT', 'stdio')
+    if transport == 'http':
+        transport = 'streamable-http'
+        mcp.settings.host = os.environ.get('RHLUNCH_HOST', mcp.settings.host)
+        mcp.settings.port = int(os.environ.get('RHLUNCH_PORT', mcp.settings.port))
+    mcp.run(transport=transport)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,8 @@ Default date: 2025-11-07 (current snapshots)
 """
 
 import json
+import re
+from functools import lru_cache
 from pathlib import Path
 from datetime import date
 import pytest
@@ -28,32 +30,40 @@ FIXTURES_DIR = Path(__file__).parent / "fixtures"
 # Default date for fixtures (update this when adding new default fixtures)
 DEFAULT_FIXTURE_DATE = date(2025, 11, 7)
 
+# Fixture date directory names: YYYY_MM_DD
+DATE_DIR_RE = re.compile(r'(\d{4})_(\d{2})_(\d{2})')
 
-def get_available_fixture_dates() -> list[date]:
+
+@lru_cache(maxsize=None)
+def get_available_fixture_dates() -> tuple[date, ...]:
     """
     Discover all available fixture dates by scanning the fixtures directory.
 
+    The directory is only scanned once per test session.
+
     Returns:
-        List of date objects for all available fixture directories, sorted chronologically.
+        Tuple of date objects for all available fixture directories, sorted chronologically.
 
     Example:
         dates = get_available_fixture_dates()
-        # Returns: [date(2025, 1, 6), date(2025, 11, 7)]
+        # Returns: (date(2025, 1, 6), date(2025, 11, 7))
     """
     dates = []
     for date_dir in FIXTURES_DIR.iterdir():
-        if date_dir.is_dir() and date_dir.name.count('_') == 2:
-            try:
-                # Parse date from directory name format: YYYY_MM_DD
-                year, month, day = date_dir.name.split('_')
-                dates.append(date(int(year), int(month), int(day)))
-            except (ValueError, TypeError):
-                # Skip directories that don't match the expected format
-                continue
-    return sorted(dates)
+        # Skip files and directories that don't match the YYYY_MM_DD format
+        match = DATE_DIR_RE.fullmatch(date_dir.name)
+        if not match or not date_dir.is_dir():
+            continue
+        try:
+            dates.append(date(int(match[1]), int(match[2]), int(match[3])))
+        except ValueError:
+            # Skip names like 2025_13_01 that aren't real dates
+            continue
+    return tuple(sorted(dates))
 
 
-def get_fixture_dates_with_file(filename: str) -> list[date]:
+@lru_cache(maxsize=None)
+def get_fixture_dates_with_file(filename: str) -> tuple[date, ...]:
     """
     Find all fixture dates that have a specific file.
 
@@ -61,30 +71,42 @@ def get_fixture_dates_with_file(filename: str) -> list[date]:
         filename: The fixture filename to look for (e.g., "kvartersmenyn_filmhuset.html")
 
     Returns:
-        List of date objects for fixture directories containing the file.
+        Tuple of date objects for fixture directories containing the file.
 
     Example:
         dates = get_fixture_dates_with_file("kvartersmenyn_filmhuset.html")
         # Returns only dates that have this file
     """
-    dates = []
-    for test_date in get_available_fixture_dates():
-        date_str = test_date.strftime("%Y_%m_%d")
-        date_dir = FIXTURES_DIR / date_str
-        fixture_file = date_dir / filename
-        if fixture_file.exists():
-            dates.append(test_date)
-    return dates
+    return tuple(
+        test_date for test_date in get_available_fixture_dates()
+        if (FIXTURES_DIR / test_date.strftime("%Y_%m_%d") / filename).exists()
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk caches out of the user's cache directory during tests."""
+    monkeypatch.setenv('RHLUNCH_CACHE_DIR', str(tmp_path / 'cache'))
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_store():
+    """Don't let ISS sessions established in one test leak into the next."""
+    from lunchscraper import iss_scraper
+    iss_scraper._auth_store.clear()
 
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+@lru_cache(maxsize=64)
 def load_fixture_file(filename: str, test_date: date = None) -> str:
     """
     Load a fixture file for a specific date from the date-organized folder structure.
 
+    Files are only read once per test session.
+
     Args:
         filename: The fixture filename (e.g., "iss_home.html")
         test_date: The date for which to load the fixture (defaults to DEFAULT_FIXTURE_DATE)
@@ -114,8 +136,7 @@ def load_fixture_file(filename: str, test_date: date = None) -> str:
             f"2. Or manually create: {date_dir}/{filename}"
         )
 
-    with open(fixture_file, "r", encoding="utf-8") as f:
-        return f.read()
+    return fixture_file.read_text(encoding="utf-8")
 
 
 def load_json_fixture(filename: str, test_date: date = None) -> dict:
@@ -141,7 +162,7 @@ def load_json_fixture(filename: str, test_date: date = None) -> dict:
 # ISS Menyer Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def iss_home_html():
     """
     Load ISS home page HTML snapshot.
@@ -152,7 +173,7 @@ def iss_home_html():
     return load_fixture_file("iss_home.html")
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def iss_gourmedia_html():
     """
     Load ISS Gourmedia restaurant page HTML snapshot.
@@ -163,11 +184,13 @@ def iss_gourmedia_html():
     return load_fixture_file("iss_gourmedia.html")
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def iss_api_response():
     """
     Load ISS API response for week containing 2025-01-06.
 
+    The same dict is shared by all tests, so treat it as read-only.
+
     This is sample data for testing. To use real data from a different week,
     use load_json_fixture("iss_api_response.json", your_date)
     """
@@ -178,7 +201,7 @@ def iss_api_response():
 # Kvartersmenyn Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def kvartersmenyn_filmhuset_html():
     """
     Load Kvartersmenyn Filmhuset page HTML snapshot.
@@ -189,7 +212,7 @@ def kvartersmenyn_filmhuset_html():
     return load_fixture_file("kvartersmenyn_filmhuset.html")
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def kvartersmenyn_karavan_html():
     """
     Load Kvartersmenyn Karavan page HTML snapshot.
@@ -6,28 +6,47 @@ with the current date. This allows for maintaining multiple snapshots over time
 for regression testing.
 
 Usage:
-    python tests/fixtures/fetch_test_data.py [--date YYYY-MM-DD]
+    python tests/fixtures/fetch_test_data.py [--date YYYY-MM-DD] [--parallel N] [--only PAGE ...]
 
-If no date is provided, uses today's date.
+If no date is provided, uses today's date. Run with --help for all options.
 """
 
-import requests
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import date
-import sys
+from urllib.parse import urlparse
+import argparse
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Get the fixtures directory
 fixtures_dir = Path(__file__).parent
 
-# Determine date for fixtures
-if len(sys.argv) > 2 and sys.argv[1] == '--date':
-    # Parse date from command line
-    date_parts = sys.argv[2].split('-')
-    fetch_date = date(int(date_parts[0]), int(date_parts[1]), int(date_parts[2]))
-else:
-    # Use today's date
-    fetch_date = date.today()
+# Pages to snapshot: (key, description, filename, URL)
+JOBS = [
+    ('iss_home', "ISS Menyer home page", 'iss_home.html', 'https://www.iss-menyer.se/'),
+    ('iss_gourmedia', "ISS Menyer Gourmedia restaurant page", 'iss_gourmedia.html',
+     'https://www.iss-menyer.se/restaurants/restaurang-gourmedia'),
+    ('filmhuset', "Kvartersmenyn Filmhuset page", 'kvartersmenyn_filmhuset.html',
+     'https://filmhuset.kvartersmenyn.se/'),
+    ('karavan', "Kvartersmenyn Karavan page", 'kvartersmenyn_karavan.html',
+     'https://karavan.kvartersmenyn.se/'),
+]
+
+parser = argparse.ArgumentParser(description="Fetch live HTML snapshots for the test fixtures.")
+parser.add_argument('--date', type=date.fromisoformat, default=date.today(),
+                    help="Date folder to save the snapshots in, as YYYY-MM-DD (default: today)")
+parser.add_argument('--parallel', type=int, default=len(JOBS),
+                    help="Number of pages to fetch at the same time")
+parser.add_argument('--only', action='append', choices=[key for key, *_ in JOBS],
+                    help="Only fetch this page (can be repeated)")
+args = parser.parse_args()
+
+fetch_date = args.date
+jobs = [job for job in JOBS if not args.only or job[0] in args.only]
 
 date_str = fetch_date.strftime("%Y_%m_%d")
 date_dir = fixtures_dir / date_str
@@ -38,67 +57,60 @@ print(f"Saving to: {date_dir}\n")
 # Create date directory if it doesn't exist
 date_dir.mkdir(exist_ok=True)
 
-# Configure session with proper headers
+# Configure session with browser headers and pooled keep-alive connections. The
+# script only needs requests, so it doesn't import the lunchscraper package.
 session = requests.Session()
 session.headers.update({
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.9,sv;q=0.8',
 })
-
-print("Fetching test data from restaurant websites...\n")
-
-# Fetch ISS Menyer home page
-try:
-    print("1. Fetching ISS Menyer home page...")
-    response = session.get('https://www.iss-menyer.se/', timeout=10)
+adapter = HTTPAdapter(pool_connections=len(JOBS), pool_maxsize=max(1, args.parallel))
+session.mount('https://', adapter)
+session.mount('http://', adapter)
+
+# Minimum time between requests to the same site, in seconds
+DOMAIN_DELAY = 0.2
+_next_request_at = {}
+_next_request_lock = threading.Lock()
+
+def wait_for_domain(url):
+    """Space out requests to the same site (e.g. *.kvartersmenyn.se) by DOMAIN_DELAY."""
+    domain = '.'.join(urlparse(url).hostname.split('.')[-2:])
+    with _next_request_lock:
+        now = time.monotonic()
+        start = max(now, _next_request_at.get(domain, now))
+        _next_request_at[domain] = start + DOMAIN_DELAY
+    time.sleep(start - now)
+
+
+def fetch_and_save(filename, url):
+    """Fetch a page and save it to the date directory, returning its size."""
+    wait_for_domain(url)
+    response = session.get(url, timeout=10)
     response.raise_for_status()
-    filename = 'iss_home.html'
     with open(date_dir / filename, 'w', encoding='utf-8') as f:
         f.write(response.text)
-    print(f"   Saved {filename} ({len(response.text)} bytes)")
-except Exception as e:
-    print(f"   ERROR: {e}")
-
-# Fetch ISS Menyer Gourmedia page
-try:
-    print("2. Fetching ISS Menyer Gourmedia restaurant page...")
-    response = session.get('https://www.iss-menyer.se/restaurants/restaurang-gourmedia', timeout=10)
-    response.raise_for_status()
-    filename = 'iss_gourmedia.html'
-    with open(date_dir / filename, 'w', encoding='utf-8') as f:
-        f.write(response.text)
-    print(f"   Saved {filename} ({len(response.text)} bytes)")
-except Exception as e:
-    print(f"   ERROR: {e}")
-
-# Fetch Kvartersmenyn Filmhuset page
-try:
-    print("3. Fetching Kvartersmenyn Filmhuset page...")
-    response = session.get('https://filmhuset.kvartersmenyn.se/', timeout=10)
-    response.raise_for_status()
-    filename = 'kvartersmenyn_filmhuset.html'
-    with open(date_dir / filename, 'w', encoding='utf-8') as f:
-        f.write(response.text)
-    print(f"   Saved {filename} ({len(response.text)} bytes)")
-except Exception as e:
-    print(f"   ERROR: {e}")
-
-# Fetch Kvartersmenyn Karavan page
-try:
-    print("4. Fetching Kvartersmenyn Karavan page...")
-    response = session.get('https://karavan.kvartersmenyn.se/', timeout=10)
-    response.raise_for_status()
-    filename = 'kvartersmenyn_karavan.html'
-    with open(date_dir / filename, 'w', encoding='utf-8') as f:
-        f.write(response.text)
-    print(f"   Saved {filename} ({len(response.text)} bytes)")
-except Exception as e:
-    print(f"   ERROR: {e}")
+    return len(response.text)
+
+
+print("Fetching test data from restaurant websites...\n")
+
+# Fetch all pages concurrently, so the total time is that of the slowest site
+with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as executor:
+    futures = {executor.submit(fetch_and_save, filename, url): (number, description, filename)
+               for number, (_, description, filename, url) in enumerate(jobs, 1)}
+    for future in as_completed(futures):
+        number, description, filename = futures[future]
+        print(f"{number}. {description}")
+        try:
+            print(f"   Saved {filename} ({future.result()} bytes)")
+        except Exception as e:
+            print(f"   ERROR: {e}")
 
 # Note: API responses should be created manually for specific test weeks
 # since we can't easily fetch this without proper authentication
-print("\n5. Note: ISS API response fixtures should be created manually")
+print(f"\n{len(jobs) + 1}. Note: ISS API response fixtures should be created manually")
 print(f"   To add API data for this date, create: {date_dir}/iss_api_response.json")
 print(f"   See README.md for the expected format")
 
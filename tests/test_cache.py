@@ -0,0 +1,251 @@
+"""Tests for the on-disk menu cache."""
+
+import time
+from datetime import date, datetime
+
+import pytest
+import requests
+import responses
+from lunchscraper import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory."""
+    monkeypatch.setenv('RHLUNCH_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+class TestCache:
+    """Tests for cache get/put."""
+
+    def test_get_cache_dir_override(self, cache_dir):
+        """Test that RHLUNCH_CACHE_DIR overrides the default location."""
+        assert cache.get_cache_dir() == cache_dir
+
+    def test_get_cache_dir_xdg(self, tmp_path, monkeypatch):
+        """Test that XDG_CACHE_HOME is honoured."""
+        monkeypatch.delenv('RHLUNCH_CACHE_DIR')
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+        assert cache.get_cache_dir() == tmp_path / 'rhlunch'
+
+    def test_put_and_get(self):
+        """Test that a stored value can be read back."""
+        menu = {'vegetarian': ['Falafel med hummus'], 'fish': [], 'meat': ['Biff med lök']}
+        cache.put(('filmhuset', 2025, 45, '2025-11-04'), menu, ttl=60)
+
+        assert cache.get(('filmhuset', 2025, 45, '2025-11-04')) == menu
+
+    def test_get_entry_includes_expiry(self):
+        """Test that get_entry returns the value with its absolute expiry."""
+        before = time.time()
+        cache.put(('filmhuset', 2025, 45, 'week'), {'måndag': {}}, ttl=60)
+
+        value, expires = cache.get_entry(('filmhuset', 2025, 45, 'week'))
+
+        assert value == {'måndag': {}}
+        assert before + 60 <= expires <= time.time() + 60
+
+    def test_get_missing(self):
+        """Test that a missing entry returns None."""
+        assert cache.get(('filmhuset', 2025, 45, 'week')) is None
+
+    def test_get_expired(self):
+        """Test that an expired entry returns None."""
+        cache.put(('karavan', 2025, 45, 'week'), {'måndag': {}}, ttl=-1)
+
+        assert cache.get(('karavan', 2025, 45, 'week')) is None
+
+    def test_keys_are_independent(self):
+        """Test that different keys don't collide."""
+        cache.put(('gourmedia', 2025, 45, 'week'), 'weekly', ttl=60)
+        cache.put(('gourmedia', 2025, 45, '2025-11-04'), 'daily', ttl=60)
+
+        assert cache.get(('gourmedia', 2025, 45, 'week')) == 'weekly'
+        assert cache.get(('gourmedia', 2025, 45, '2025-11-04')) == 'daily'
+
+    def test_delete(self):
+        """Test that a deleted entry is gone and deleting it again is harmless."""
+        cache.put(('karavan', 2025, 45, 'week'), {'måndag': {}}, ttl=60)
+        cache.delete(('karavan', 2025, 45, 'week'))
+        cache.delete(('karavan', 2025, 45, 'week'))
+
+        assert cache.get(('karavan', 2025, 45, 'week')) is None
+
+    def test_get_corrupt_entry(self, cache_dir):
+        """Test that an unreadable entry is treated as a miss."""
+        cache.put(('filmhuset', 2025, 45, 'week'), {'måndag': {}}, ttl=60)
+        for path in cache_dir.iterdir():
+            path.write_text('not json', encoding='utf-8')
+
+        assert cache.get(('filmhuset', 2025, 45, 'week')) is None
+
+    def test_put_unserializable_value(self, cache_dir):
+        """Test that unserializable values are skipped without raising."""
+        cache.put(('filmhuset', 2025, 45, 'week'), object(), ttl=60)
+
+        assert cache.get(('filmhuset', 2025, 45, 'week')) is None
+        assert list(cache_dir.iterdir()) == []
+
+
+class TestMenuTTL:
+    """Tests for cutting menu TTLs off at the morning menu update."""
+
+    @pytest.fixture
+    def now(self, monkeypatch):
+        """Get a function that sets the current time seen by the cache."""
+        def set_now(value):
+            class FakeDatetime(datetime):
+                @classmethod
+                def now(cls, tz=None):
+                    return value
+            monkeypatch.setattr(cache, 'datetime', FakeDatetime)
+        return set_now
+
+    def test_short_ttl_is_kept(self, now):
+        """Test that a TTL ending before the menu update is unchanged."""
+        now(datetime(2025, 11, 4, 12, 0))
+
+        assert cache.menu_ttl(60 * 60) == 60 * 60
+
+    def test_cut_off_at_next_morning(self, now):
+        """Test that a long TTL ends at the next morning's menu update."""
+        now(datetime(2025, 11, 3, 23, 0))
+
+        assert cache.menu_ttl(7 * 24 * 60 * 60) == 6 * 60 * 60
+
+    def test_cut_off_before_update_the_same_morning(self, now):
+        """Test that a menu fetched before the update expires at the update."""
+        now(datetime(2025, 11, 3, 4, 30))
+
+        assert cache.menu_ttl(24 * 60 * 60) == 30 * 60
+
+
+class TestFetchText:
+    """Tests for conditional GETs through the cache."""
+
+    URL = 'https://filmhuset.kvartersmenyn.se/'
+
+    @pytest.fixture
+    def today(self, monkeypatch):
+        """Get a function that sets the date seen by the cache."""
+        def set_today(value):
+            class FakeDate(date):
+                @classmethod
+                def today(cls):
+                    return value
+            monkeypatch.setattr(cache, 'date', FakeDate)
+        return set_today
+
+    @responses.activate
+    def test_not_modified_reuses_stored_body(self):
+        """Test that a 304 response returns the previously stored body."""
+        responses.add(responses.GET, self.URL, body='<html>menu</html>', status=200,
+                      headers={'ETag': '"abc"'})
+        responses.add(responses.GET, self.URL, status=304)
+        session = requests.Session()
+
+        assert cache.fetch_text(session, self.URL) == '<html>menu</html>'
+        assert cache.fetch_text(session, self.URL) == '<html>menu</html>'
+        assert responses.calls[1].request.headers['If-None-Match'] == '"abc"'
+
+    @responses.activate
+    def test_last_modified_is_sent_back(self):
+        """Test that Last-Modified is revalidated with If-Modified-Since."""
+        last_modified = 'Mon, 03 Nov 2025 06:00:00 GMT'
+        responses.add(responses.GET, self.URL, body='old', status=200,
+                      headers={'Last-Modified': last_modified})
+        responses.add(responses.GET, self.URL, body='new', status=200)
+        session = requests.Session()
+
+        cache.fetch_text(session, self.URL)
+
+        assert cache.fetch_text(session, self.URL) == 'new'
+        assert responses.calls[1].request.headers['If-Modified-Since'] == last_modified
+
+    @responses.activate
+    def test_without_validators_nothing_is_stored(self, cache_dir):
+        """Test that responses without ETag/Last-Modified are not stored."""
+        responses.add(responses.GET, self.URL, body='menu', status=200)
+
+        assert cache.fetch_text(requests.Session(), self.URL) == 'menu'
+        assert list(cache_dir.iterdir()) == []
+
+    @responses.activate
+    def test_unreachable_site_falls_back_to_stored_body(self):
+        """Test that a connection error returns the previously stored body."""
+        responses.add(responses.GET, self.URL, body='<html>menu</html>', status=200,
+                      headers={'ETag': '"abc"'})
+        responses.add(responses.GET, self.URL, body=requests.ConnectionError('down'))
+        session = requests.Session()
+
+        cache.fetch_text(session, self.URL)
+
+        assert cache.fetch_text(session, self.URL) == '<html>menu</html>'
+
+    @responses.activate
+    def test_fallback_is_reported(self):
+        """Test that used_fallback() tells a stored copy from a fresh one."""
+        responses.add(responses.GET, self.URL, body='<html>menu</html>', status=200,
+                      headers={'ETag': '"abc"'})
+        responses.add(responses.GET, self.URL, body=requests.ConnectionError('down'))
+        session = requests.Session()
+
+        cache.reset_fallback()
+        cache.fetch_text(session, self.URL)
+        assert not cache.used_fallback()
+
+        cache.fetch_text(session, self.URL)
+        assert cache.used_fallback()
+
+        cache.reset_fallback()
+        assert not cache.used_fallback()
+
+    @responses.activate
+    def test_unreachable_site_ignores_last_weeks_copy(self, today):
+        """Test that a copy stored in an earlier ISO week isn't used as a fallback."""
+        responses.add(responses.GET, self.URL, body='<html>week 45</html>', status=200,
+                      headers={'ETag': '"abc"'})
+        responses.add(responses.GET, self.URL, body=requests.ConnectionError('down'))
+        session = requests.Session()
+
+        # Fetched on Sunday of week 45, unreachable on Monday of week 46
+        today(date(2025, 11, 9))
+        cache.fetch_text(session, self.URL)
+        today(date(2025, 11, 10))
+
+        with pytest.raises(requests.ConnectionError):
+            cache.fetch_text(session, self.URL)
+
+    @responses.activate
+    def test_not_modified_renews_the_stored_week(self, today):
+        """Test that a page revalidated this week can be a fallback this week."""
+        responses.add(responses.GET, self.URL, body='<html>menu</html>', status=200,
+                      headers={'ETag': '"abc"'})
+        responses.add(responses.GET, self.URL, status=304)
+        responses.add(responses.GET, self.URL, body=requests.ConnectionError('down'))
+        session = requests.Session()
+
+        today(date(2025, 11, 9))
+        cache.fetch_text(session, self.URL)
+        today(date(2025, 11, 10))
+        cache.fetch_text(session, self.URL)
+
+        assert cache.fetch_text(session, self.URL) == '<html>menu</html>'
+
+    @responses.activate
+    def test_unreachable_site_without_stored_body_raises(self):
+        """Test that a connection error raises when nothing is stored."""
+        responses.add(responses.GET, self.URL, body=requests.ConnectionError('down'))
+
+        with pytest.raises(requests.ConnectionError):
+            cache.fetch_text(requests.Session(), self.URL)
+
+    @responses.activate
+    def test_error_status_raises(self):
+        """Test that error responses raise."""
+        responses.add(responses.GET, self.URL, status=500)
+
+        with pytest.raises(requests.HTTPError):
+            cache.fetch_text(requests.Session(), self.URL)
@@ -0,0 +1,106 @@
+"""Tests for the command line interface."""
+
+import pytest
+from click.testing import CliRunner
+from lunchscraper import cache, cli
+
+MENU = {'vegetarian': ['Falafel med hummus'], 'fish': ['Lax med dillsås'], 'meat': ['Biff med lök']}
+WEEKLY_MENU = {'måndag': MENU, 'tisdag': {'vegetarian': [], 'fish': [], 'meat': []}}
+
+
+class FakeScraper:
+    """Scraper stand-in that counts its fetches."""
+
+    calls = []
+
+    def __init__(self, config):
+        self.name = config['name']
+
+    def get_menu_for_day(self, target_date=None):
+        FakeScraper.calls.append((self.name, 'day'))
+        return MENU
+
+    def get_weekly_menu(self):
+        FakeScraper.calls.append((self.name, 'week'))
+        return WEEKLY_MENU
+
+
+@pytest.fixture(autouse=True)
+def fake_scraper(tmp_path, monkeypatch):
+    """Use a temporary cache and stub out the restaurant scrapers."""
+    monkeypatch.setenv('RHLUNCH_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(cli, '_create_scraper', FakeScraper)
+    FakeScraper.calls = []
+    return FakeScraper
+
+
+def run(*args):
+    """Run the lunch command with the given arguments."""
+    return CliRunner().invoke(cli.main, list(args))
+
+
+class TestCli:
+    """Tests for the lunch command."""
+
+    def test_daily_menu(self):
+        """Test that today's menu is shown for every restaurant."""
+        result = run()
+
+        assert result.exit_code == 0
+        for config in cli.RESTAURANTS.values():
+            assert config['name'].upper() in result.output
+        assert 'Falafel med hummus' in result.output
+        assert 'Biff med lök' in result.output
+
+    def test_cache_miss_then_hit(self, fake_scraper):
+        """Test that a second run is served from the cache without scraping."""
+        first = run('-r', 'filmhuset')
+        second = run('-r', 'filmhuset')
+
+        assert fake_scraper.calls == [('Filmhuset', 'day')]
+        assert second.output == first.output
+
+    def test_daily_and_weekly_are_cached_separately(self, fake_scraper):
+        """Test that the weekly view doesn't reuse the cached daily menu."""
+        run('-r', 'karavan')
+        result = run('-r', 'karavan', '-w')
+
+        assert fake_scraper.calls == [('Karavan', 'day'), ('Karavan', 'week')]
+        assert 'Monday' in result.output
+        assert 'No menu available' in result.output
+
+    def test_refresh_bypasses_cache(self, fake_scraper):
+        """Test that --refresh scrapes again even when a menu is cached."""
+        run('-r', 'gourmedia')
+        result = run('-r', 'gourmedia', '--refresh')
+
+        assert result.exit_code == 0
+        assert fake_scraper.calls == [('Gourmedia', 'day'), ('Gourmedia', 'day')]
+
+    def test_menu_from_fallback_is_not_cached(self, fake_scraper, monkeypatch):
+        """Test that a menu built from a stored page isn't cached."""
+        monkeypatch.setattr(cache, 'used_fallback', lambda: True)
+        run('-r', 'filmhuset')
+        run('-r', 'filmhuset')
+
+        assert fake_scraper.calls == [('Filmhuset', 'day'), ('Filmhuset', 'day')]
+
+    def test_category_filter(self):
+        """Test that -v shows only the vegetarian dishes."""
+        result = run('-r', 'filmhuset', '-v')
+
+        assert 'Falafel med hummus' in result.output
+        assert 'Lax med dillsås' not in result.output
+        assert 'Biff med lök' not in result.output
+
+    def test_failed_fetch(self, monkeypatch):
+        """Test that errors are reported and the command aborts if nothing was shown."""
+        def fail(config):
+            raise Exception("Failed to fetch menu page: down")
+        monkeypatch.setattr(cli, '_create_scraper', fail)
+
+        result = run('-r', 'karavan')
+
+        assert result.exit_code == 1
+        assert 'Error fetching menu from Karavan' in result.output
+        assert 'Failed to fetch any menus' in result.output
@@ -117,6 +117,12 @@ class TestClassifyDish:
         assert DishClassifier.classify_dish("Dagens rätt serveras med potatis") == 'meat'
         assert DishClassifier.classify_dish("Rätt till dagens") == 'meat'
 
+    def test_hint_words_match_whole_words_only(self):
+        """Test that hint words inside other words don't default to meat."""
+        assert DishClassifier.classify_dish("< Tillbaka") is None
+        assert DishClassifier.classify_dish("Tortilla") is None
+        assert DishClassifier.classify_dish("Pasta med, pesto") == 'meat'
+
     def test_classify_mixed_keywords(self):
         """Test dishes with multiple keywords."""
         # When both fish and meat keywords appear, meat should win (checked first)
@@ -274,6 +280,15 @@ class TestClassifyDishes:
 
         assert result == {'vegetarian': [], 'meat': [], 'fish': []}
 
+    def test_classify_dishes_result_is_a_copy(self):
+        """Test that modifying a result doesn't affect later results for the same dishes."""
+        dishes = ["Falafel med hummus", "Biff med lök"]
+
+        first = DishClassifier.classify_dishes(dishes)
+        first['vegetarian'].append("Extra")
+
+        assert DishClassifier.classify_dishes(dishes)['vegetarian'] == ["Falafel med hummus"]
+
     def test_classify_dishes_real_world_example(self):
         """Test with a realistic menu."""
         dishes = [
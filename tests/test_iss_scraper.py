@@ -2,25 +2,58 @@
 
 import json
 import base64
+import time
 from datetime import date
 from unittest.mock import patch, MagicMock
 import pytest
+import requests
 import responses
-from lunchscraper.iss_scraper import ISSMenuScraper
+from lunchscraper import cache, iss_scraper
+from lunchscraper.iss_scraper import AUTH_TOKEN_RE, ISSMenuScraper
 from tests.conftest import get_fixture_dates_with_file, load_fixture_file, load_json_fixture
 
+HOME_URL = 'https://www.iss-menyer.se/'
+RESTAURANT_URL = 'https://www.iss-menyer.se/restaurang-gourmedia'
+API_URL = 'https://www.iss-menyer.se/_api/cloud-data/v2/items/query'
+
+
+def _register_session_pages(home_html, restaurant_html):
+    """Mock the home and restaurant pages visited to establish a session."""
+    responses.add(responses.GET, HOME_URL, body=home_html, status=200)
+    responses.add(responses.GET, RESTAURANT_URL, body=restaurant_html, status=200)
+
 
 class TestISSMenuScraper:
     """Tests for ISSMenuScraper class."""
 
-    @pytest.fixture
-    def scraper(self):
-        """Create a scraper instance for testing."""
-        return ISSMenuScraper(
-            restaurant_url="https://www.iss-menyer.se/restaurang-gourmedia",
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def shared_scraper():
+        """Create one scraper instance (and a copy of its initial headers) for all tests."""
+        scraper = ISSMenuScraper(
+            restaurant_url=RESTAURANT_URL,
             restaurant_id="Restaurang Gourmedia",
             restaurant_name="Gourmedia"
         )
+        return scraper, scraper.session.headers.copy()
+
+    @pytest.fixture
+    def scraper(self, shared_scraper):
+        """Get the shared scraper with its session state reset for this test."""
+        scraper, initial_headers = shared_scraper
+        scraper._session_established = False
+        scraper._session_reused = False
+        scraper._auth_token = None
+        scraper.session.cookies.clear()
+        scraper.session.headers = initial_headers.copy()
+        return scraper
+
+    @pytest.fixture
+    def established_scraper(self, scraper):
+        """Get the scraper with a session already established, so only the API is called."""
+        scraper._session_established = True
+        scraper._auth_token = 'test-token'
+        return scraper
 
 
     def test_init(self, scraper):
@@ -54,14 +87,28 @@ class TestISSMenuScraper:
         assert query_data['query']['filter']['restrauntId'] == 'Restaurang Gourmedia'
         assert query_data['appId'] == '16d45e35-d3d8-4d5e-b24d-2a680b7e5089'
 
+    @pytest.fixture
+    def clear_query_cache(self):
+        """Clear memoized API queries before and after the test."""
+        iss_scraper._encode_api_query.cache_clear()
+        yield
+        iss_scraper._encode_api_query.cache_clear()
+
+    def test_build_api_query_without_orjson(self, clear_query_cache, monkeypatch):
+        """Test that the stdlib fallback encodes the same query as orjson."""
+        scraper = ISSMenuScraper(RESTAURANT_URL, "Restaurang Söderåsen", "Söderåsen")
+        query = scraper._build_api_query(week_number=45)
+        monkeypatch.setattr(iss_scraper, 'orjson', None)
+        iss_scraper._encode_api_query.cache_clear()
+
+        assert scraper._build_api_query(week_number=45) == query
+
     def test_parse_day_menu_from_text(self, scraper):
         """Test parsing menu text for a single day."""
         menu_text = "Kött:\nBiff med bearnaisesås\nVegetariskt:\nFalafel med hummus"
         result = scraper._parse_day_menu_from_text(menu_text)
 
-        assert 'vegetarian' in result
-        assert 'meat' in result
-        assert 'fish' in result
+        assert result.keys() == {'vegetarian', 'fish', 'meat'}
         assert 'Falafel med hummus' in result['vegetarian']
         assert 'Biff med bearnaisesås' in result['meat']
 
@@ -84,11 +131,7 @@ class TestISSMenuScraper:
         """Test parsing the API response."""
         weekly_menu = scraper._parse_api_response(iss_api_response)
 
-        assert 'måndag' in weekly_menu
-        assert 'tisdag' in weekly_menu
-        assert 'onsdag' in weekly_menu
-        assert 'torsdag' in weekly_menu
-        assert 'fredag' in weekly_menu
+        assert weekly_menu.keys() >= {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag'}
 
         # Check Monday's menu
         monday_menu = weekly_menu['måndag']
@@ -121,21 +164,7 @@ class TestISSMenuScraper:
     @responses.activate
     def test_establish_session(self, scraper, iss_home_html, iss_gourmedia_html):
         """Test session establishment."""
-        # Mock home page request
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/',
-            body=iss_home_html,
-            status=200
-        )
-
-        # Mock restaurant page request
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/restaurang-gourmedia',
-            body=iss_gourmedia_html,
-            status=200
-        )
+        _register_session_pages(iss_home_html, iss_gourmedia_html)
 
         scraper._establish_session()
 
@@ -143,13 +172,30 @@ class TestISSMenuScraper:
         # Real page should contain auth token
         assert scraper._auth_token is not None or scraper._auth_token == ""
 
+    def test_extract_auth_token(self, scraper, iss_gourmedia_html):
+        """Test that the viewer-model fallback finds the same token as the regex."""
+        token = scraper._extract_auth_token(iss_gourmedia_html)
+
+        assert token is not None
+        assert token == AUTH_TOKEN_RE.search(iss_gourmedia_html).group(1)
+
+    def test_extract_auth_token_without_orjson(self, scraper, iss_gourmedia_html, monkeypatch):
+        """Test that JSON decoding falls back to the stdlib when orjson is missing."""
+        monkeypatch.setattr(iss_scraper, 'orjson', None)
+
+        assert scraper._extract_auth_token(iss_gourmedia_html) is not None
+
+    def test_extract_auth_token_missing_script(self, scraper):
+        """Test that a page without the viewer-model script yields no token."""
+        assert scraper._extract_auth_token('<html><body></body></html>') is None
+
     @responses.activate
     def test_establish_session_failure(self, scraper):
         """Test session establishment with network failure."""
         # Mock failed home page request
         responses.add(
             responses.GET,
-            'https://www.iss-menyer.se/',
+            HOME_URL,
             status=500
         )
 
@@ -158,27 +204,79 @@ class TestISSMenuScraper:
 
         assert scraper._session_established is False
 
+    @responses.activate
+    def test_establish_session_reuses_stored_session(self, scraper, iss_home_html, iss_gourmedia_html):
+        """Test that a later scraper reuses the session instead of visiting the pages again."""
+        _register_session_pages(iss_home_html, iss_gourmedia_html)
+        scraper._establish_session()
+
+        # Also survives a new process, which only has the on-disk cache
+        iss_scraper._auth_store.clear()
+        other = ISSMenuScraper(restaurant_url=RESTAURANT_URL)
+        other._establish_session()
+
+        assert len(responses.calls) == 2
+        assert other._session_established is True
+        assert other._auth_token == scraper._auth_token
+
+    def test_stored_session_keeps_its_expiry(self, scraper):
+        """Test that a session loaded from disk isn't kept in memory past its disk expiry."""
+        cache.put(('iss-auth', scraper.restaurant_url), {'token': 'stored', 'cookies': {}}, ttl=5)
+        iss_scraper._auth_store.clear()
+
+        assert iss_scraper._get_stored_auth(scraper.restaurant_url)['token'] == 'stored'
+        assert iss_scraper._auth_store[scraper.restaurant_url][0] <= time.time() + 5
+
+    @responses.activate
+    def test_api_failure_forgets_stored_session(self, scraper, iss_home_html, iss_gourmedia_html):
+        """Test that a failed API call drops the stored session."""
+        _register_session_pages(iss_home_html, iss_gourmedia_html)
+        responses.add(responses.GET, API_URL, status=401)
+
+        with pytest.raises(Exception, match="Failed to fetch menu from API"):
+            scraper._fetch_menu_from_api(week_number=45)
+
+        assert iss_scraper._get_stored_auth(scraper.restaurant_url) is None
+
+    @responses.activate
+    @pytest.mark.parametrize("api_response", [
+        {'status': 500},
+        {'body': requests.ConnectTimeout('timed out')},
+        {'body': 'not json', 'status': 200},
+    ])
+    def test_other_api_failure_keeps_stored_session(self, scraper, iss_home_html,
+                                                    iss_gourmedia_html, api_response):
+        """Test that errors other than a rejected session keep the stored session."""
+        _register_session_pages(iss_home_html, iss_gourmedia_html)
+        responses.add(responses.GET, API_URL, **api_response)
+
+        with pytest.raises(Exception, match="Failed to fetch menu from API"):
+            scraper._fetch_menu_from_api(week_number=45)
+
+        assert iss_scraper._get_stored_auth(scraper.restaurant_url) is not None
+
+    @responses.activate
+    def test_rejected_stored_session_is_renewed(self, scraper, iss_api_response, iss_home_html,
+                                                iss_gourmedia_html):
+        """Test that a stored session rejected by the API is replaced and the call retried."""
+        iss_scraper._store_auth(scraper.restaurant_url, {'token': 'expired', 'cookies': {}})
+        responses.add(responses.GET, API_URL, status=401)
+        _register_session_pages(iss_home_html, iss_gourmedia_html)
+        responses.add(responses.GET, API_URL, json=iss_api_response, status=200)
+
+        assert scraper._fetch_menu_from_api(week_number=45) == iss_api_response
+        assert responses.calls[0].request.headers['Authorization'] == 'expired'
+        assert responses.calls[3].request.headers['Authorization'] != 'expired'
+
     @responses.activate
     def test_fetch_menu_from_api(self, scraper, iss_api_response, iss_home_html, iss_gourmedia_html):
         """Test fetching menu from API."""
-        # Mock session establishment
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/',
-            body=iss_home_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/restaurang-gourmedia',
-            body=iss_gourmedia_html,
-            status=200
-        )
+        _register_session_pages(iss_home_html, iss_gourmedia_html)
 
         # Mock API request
         responses.add(
             responses.GET,
-            'https://www.iss-menyer.se/_api/cloud-data/v2/items/query',
+            API_URL,
             json=iss_api_response,
             status=200
         )
@@ -188,58 +286,31 @@ class TestISSMenuScraper:
         assert result == iss_api_response
 
     @responses.activate
-    def test_fetch_menu_from_api_failure(self, scraper, iss_home_html, iss_gourmedia_html):
+    def test_fetch_menu_from_api_failure(self, established_scraper):
         """Test API fetch failure."""
-        # Mock session establishment
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/',
-            body=iss_home_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/restaurang-gourmedia',
-            body=iss_gourmedia_html,
-            status=200
-        )
-
         # Mock API request failure
         responses.add(
             responses.GET,
-            'https://www.iss-menyer.se/_api/cloud-data/v2/items/query',
+            API_URL,
             status=500
         )
 
         with pytest.raises(Exception, match="Failed to fetch menu from API"):
-            scraper._fetch_menu_from_api(week_number=45)
+            established_scraper._fetch_menu_from_api(week_number=45)
 
     @responses.activate
-    def test_get_menu_for_day(self, scraper, iss_api_response, iss_home_html, iss_gourmedia_html):
+    def test_get_menu_for_day(self, established_scraper, iss_api_response):
         """Test getting menu for a specific day."""
-        # Mock session and API
         responses.add(
             responses.GET,
-            'https://www.iss-menyer.se/',
-            body=iss_home_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/restaurang-gourmedia',
-            body=iss_gourmedia_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/_api/cloud-data/v2/items/query',
+            API_URL,
             json=iss_api_response,
             status=200
         )
 
         # Test Monday (weekday 0)
         test_date = date(2025, 1, 6)  # This is a Monday
-        menu = scraper.get_menu_for_day(test_date)
+        menu = established_scraper.get_menu_for_day(test_date)
 
         assert 'vegetarian' in menu
         assert 'meat' in menu
@@ -247,42 +318,25 @@ class TestISSMenuScraper:
         assert 'Kycklingfilé med currysås och ris' in menu['meat']
 
     @responses.activate
-    def test_get_weekly_menu(self, scraper, iss_api_response, iss_home_html, iss_gourmedia_html):
+    def test_get_weekly_menu(self, established_scraper, iss_api_response):
         """Test getting the full weekly menu."""
-        # Mock session and API
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/',
-            body=iss_home_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/restaurang-gourmedia',
-            body=iss_gourmedia_html,
-            status=200
-        )
         responses.add(
             responses.GET,
-            'https://www.iss-menyer.se/_api/cloud-data/v2/items/query',
+            API_URL,
             json=iss_api_response,
             status=200
         )
 
-        weekly_menu = scraper.get_weekly_menu()
+        weekly_menu = established_scraper.get_weekly_menu()
 
-        assert 'måndag' in weekly_menu
-        assert 'tisdag' in weekly_menu
-        assert 'onsdag' in weekly_menu
-        assert 'torsdag' in weekly_menu
-        assert 'fredag' in weekly_menu
+        assert weekly_menu.keys() >= {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag'}
 
         # Verify some content
         assert 'Falafel med hummus och sallad' in weekly_menu['måndag']['vegetarian']
         assert 'Lax med dillsås och potatis' in weekly_menu['tisdag']['fish']
 
     @responses.activate
-    def test_get_menu_for_day_not_found(self, scraper, iss_home_html, iss_gourmedia_html):
+    def test_get_menu_for_day_not_found(self, established_scraper):
         """Test getting menu when day is not in the response."""
         # Mock with empty menuSwedish
         empty_response = {
@@ -305,19 +359,7 @@ class TestISSMenuScraper:
 
         responses.add(
             responses.GET,
-            'https://www.iss-menyer.se/',
-            body=iss_home_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/restaurang-gourmedia',
-            body=iss_gourmedia_html,
-            status=200
-        )
-        responses.add(
-            responses.GET,
-            'https://www.iss-menyer.se/_api/cloud-data/v2/items/query',
+            API_URL,
             json=empty_response,
             status=200
         )
@@ -325,7 +367,7 @@ class TestISSMenuScraper:
         test_date = date(2025, 1, 6)  # Monday
 
         with pytest.raises(Exception, match="Could not parse any menu data"):
-            scraper.get_menu_for_day(test_date)
+            established_scraper.get_menu_for_day(test_date)
 
 
 # ============================================================================
@@ -368,19 +410,14 @@ class TestISSMenuScraperWithRealFixtures:
 
         # Check that we have expected weekdays
         valid_days = {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag', 'lördag', 'söndag'}
-        for day in result.keys():
-            assert day in valid_days, f"Unexpected day '{day}' in menu for {fixture_date}"
+        assert result.keys() <= valid_days, f"Unexpected days {result.keys() - valid_days} in menu for {fixture_date}"
 
         # Check that each day has the expected structure
         for day, menu in result.items():
-            assert 'vegetarian' in menu, f"Missing 'vegetarian' category for {day} on {fixture_date}"
-            assert 'fish' in menu, f"Missing 'fish' category for {day} on {fixture_date}"
-            assert 'meat' in menu, f"Missing 'meat' category for {day} on {fixture_date}"
+            assert menu.keys() == {'vegetarian', 'fish', 'meat'}, f"Unexpected categories for {day} on {fixture_date}"
 
             # Check that dishes are lists
-            assert isinstance(menu['vegetarian'], list), f"'vegetarian' should be a list for {day} on {fixture_date}"
-            assert isinstance(menu['fish'], list), f"'fish' should be a list for {day} on {fixture_date}"
-            assert isinstance(menu['meat'], list), f"'meat' should be a list for {day} on {fixture_date}"
+            assert all(isinstance(dishes, list) for dishes in menu.values()), f"Dishes should be lists for {day} on {fixture_date}"
 
     @pytest.mark.parametrize(
         "fixture_date",
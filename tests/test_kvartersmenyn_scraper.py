@@ -4,24 +4,33 @@ from datetime import date
 from unittest.mock import patch, MagicMock
 import pytest
 import responses
-from bs4 import BeautifulSoup
-from lunchscraper.kvartersmenyn_scraper import KvartersmenynsMenuScraper
+from lunchscraper.kvartersmenyn_scraper import KvartersmenynsMenuScraper, _parse_html
 from tests.conftest import get_fixture_dates_with_file, load_fixture_file
 
+MENU_URL = 'https://kvartersmenyn.se/filmhuset'
+
 
 class TestKvartersmenynsMenuScraper:
     """Tests for KvartersmenynsMenuScraper class."""
 
-    @pytest.fixture
-    def scraper(self):
-        """Create a scraper instance for testing."""
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def shared_scraper():
+        """Create one scraper instance for all tests."""
         return KvartersmenynsMenuScraper(
-            restaurant_url="https://kvartersmenyn.se/filmhuset",
+            restaurant_url=MENU_URL,
             restaurant_name="Filmhuset"
         )
 
     @pytest.fixture
-    def sample_html(self):
+    def scraper(self, shared_scraper):
+        """Get the shared scraper without cookies left over from earlier tests."""
+        shared_scraper.session.cookies.clear()
+        return shared_scraper
+
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def sample_html():
         """Sample HTML from Kvartersmenyn page."""
         return """
         <html>
@@ -47,8 +56,9 @@ class TestKvartersmenynsMenuScraper:
         </html>
         """
 
-    @pytest.fixture
-    def sample_html_with_allergen_codes(self):
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def sample_html_with_allergen_codes():
         """Sample HTML with allergen codes."""
         return """
         <html>
@@ -63,8 +73,9 @@ class TestKvartersmenynsMenuScraper:
         </html>
         """
 
-    @pytest.fixture
-    def sample_html_with_category_markers(self):
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def sample_html_with_category_markers():
         """Sample HTML with category markers."""
         return """
         <html>
@@ -83,124 +94,122 @@ class TestKvartersmenynsMenuScraper:
         </html>
         """
 
+    @pytest.fixture
+    def sample_page(self, sample_html):
+        """Serve sample_html as the restaurant page."""
+        with responses.RequestsMock() as mock:
+            mock.add(responses.GET, MENU_URL, body=sample_html, status=200)
+            yield mock
+
     def test_init(self, scraper):
         """Test scraper initialization."""
         assert scraper.restaurant_name == "Filmhuset"
         assert scraper.restaurant_url == "https://kvartersmenyn.se/filmhuset"
         assert scraper.session is not None
 
-    @responses.activate
-    def test_fetch_page_success(self, scraper, sample_html):
+    def test_fetch_page_success(self, scraper, sample_page):
         """Test successful page fetch."""
+        root = scraper._fetch_page()
+        assert root.find('.//div[@class="meny"]') is not None
+
+    @responses.activate
+    def test_fetch_page_without_menu(self, scraper):
+        """Test that a page without a menu div isn't parsed."""
         responses.add(
             responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
-            body=sample_html,
+            MENU_URL,
+            body='<html><body><div>Stängt idag</div>'
+                 '<a href="https://kvartersmenyn.se/">kvartersmenyn</a></body></html>',
             status=200
         )
 
-        soup = scraper._fetch_page()
-        assert isinstance(soup, BeautifulSoup)
-        assert soup.find('div', class_='meny') is not None
+        assert scraper._fetch_page() is None
+        assert scraper._parse_weekly_menu(None) == {}
+
+    @responses.activate
+    def test_fetch_page_with_menu_among_other_classes(self, scraper):
+        """Test that a menu div with several classes is still parsed."""
+        responses.add(
+            responses.GET,
+            MENU_URL,
+            body='<html><body><div class="lunch meny">Måndag<br>'
+                 'Falafel med hummus</div></body></html>',
+            status=200
+        )
+
+        root = scraper._fetch_page()
+
+        assert scraper._parse_weekly_menu(root) == {
+            'måndag': {'vegetarian': ['Falafel med hummus'], 'fish': [], 'meat': []}}
 
     @responses.activate
     def test_fetch_page_failure(self, scraper):
         """Test page fetch failure."""
         responses.add(
             responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
+            MENU_URL,
             status=500
         )
 
         with pytest.raises(Exception, match="Failed to fetch menu page"):
             scraper._fetch_page()
 
-    def test_parse_dishes_with_climate_ratings(self, scraper):
-        """Test parsing dishes with climate ratings."""
-        dishes = [
-            "A Kycklingfilé med currysås",
-            "B Lax med dillsås",
-            "C Falafel med hummus"
-        ]
-
-        result = scraper._parse_dishes(dishes)
-
-        assert 'Kycklingfilé med currysås' in result['meat']
-        assert 'Lax med dillsås' in result['fish']
-        assert 'Falafel med hummus' in result['vegetarian']
-
-    def test_parse_dishes_with_allergen_codes(self, scraper):
-        """Test parsing dishes with allergen codes."""
-        dishes = [
-            "A Kycklingfilé med currysås _gluten_ _laktos_",
-            "B Halloumi med sallad _laktos_"
-        ]
-
-        result = scraper._parse_dishes(dishes)
-
-        # Allergen codes should be removed
-        assert 'Kycklingfilé med currysås' in result['meat']
-        assert 'Halloumi med sallad' in result['vegetarian']
-
-        # Check that allergen codes are not in the result
-        for category_dishes in result.values():
-            for dish in category_dishes:
-                assert '_gluten_' not in dish
-                assert '_laktos_' not in dish
-
-    def test_parse_dishes_multiline(self, scraper):
-        """Test parsing dishes that span multiple lines."""
-        dishes = [
-            "A Kycklingfilé med currysås",
-            "serveras med ris"
-        ]
-
-        result = scraper._parse_dishes(dishes)
-
-        # Should combine into one dish
-        combined = ' '.join(result['meat'])
-        assert 'Kycklingfilé med currysås' in combined
-        assert 'serveras med ris' in combined
-
-    def test_parse_dishes_empty_list(self, scraper):
-        """Test parsing empty dish list."""
-        result = scraper._parse_dishes([])
-        assert result == {'vegetarian': [], 'fish': [], 'meat': []}
-
-    def test_parse_dishes_with_standalone_metadata(self, scraper):
-        """Test that standalone metadata lines (with climate rating prefix) are filtered."""
-        dishes = [
-            "A Kycklingfilé med currysås",
-            "B Klimato rating info",  # Has B prefix so treated as new dish, then filtered
-        ]
-
-        result = scraper._parse_dishes(dishes)
-
-        # First dish should be parsed, second filtered as metadata
-        assert 'Kycklingfilé med currysås' in result['meat']
-        # Klimato line should be filtered out
-        assert len(result['meat']) == 1
+    @pytest.mark.parametrize(
+        "dishes,expected",
+        [
+            pytest.param(
+                ["A Kycklingfilé med currysås", "B Lax med dillsås", "C Falafel med hummus"],
+                {'vegetarian': ['Falafel med hummus'], 'fish': ['Lax med dillsås'],
+                 'meat': ['Kycklingfilé med currysås']},
+                id="climate_ratings",
+            ),
+            pytest.param(
+                # Allergen codes should be removed
+                ["A Kycklingfilé med currysås _gluten_ _laktos_", "B Halloumi med sallad _laktos_"],
+                {'vegetarian': ['Halloumi med sallad'], 'fish': [],
+                 'meat': ['Kycklingfilé med currysås']},
+                id="allergen_codes",
+            ),
+            pytest.param(
+                # Continuation lines are combined into one dish
+                ["A Kycklingfilé med currysås", "serveras med ris"],
+                {'vegetarian': [], 'fish': [],
+                 'meat': ['Kycklingfilé med currysås serveras med ris']},
+                id="multiline",
+            ),
+            pytest.param(
+                [],
+                {'vegetarian': [], 'fish': [], 'meat': []},
+                id="empty_list",
+            ),
+            pytest.param(
+                # Has B prefix so treated as new dish, then filtered as metadata
+                ["A Kycklingfilé med currysås", "B Klimato rating info"],
+                {'vegetarian': [], 'fish': [], 'meat': ['Kycklingfilé med currysås']},
+                id="standalone_metadata",
+            ),
+        ],
+    )
+    def test_parse_dishes(self, scraper, dishes, expected):
+        """Test parsing dish lines into categories."""
+        assert scraper._parse_dishes(dishes) == expected
 
     def test_parse_weekly_menu(self, scraper, sample_html):
         """Test parsing weekly menu from HTML."""
-        soup = BeautifulSoup(sample_html, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(sample_html)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
-        assert 'måndag' in weekly_menu
-        assert 'tisdag' in weekly_menu
-        assert 'onsdag' in weekly_menu
-        assert 'torsdag' in weekly_menu
-        assert 'fredag' in weekly_menu
+        assert weekly_menu.keys() >= {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag'}
 
         # Check specific dishes (combined from multiline)
-        assert any('Kycklingfilé med currysås' in dish for dish in weekly_menu['måndag']['meat'])
+        assert 'Kycklingfilé med currysås serveras med ris' in weekly_menu['måndag']['meat']
         assert 'Lax med citron och dill' in weekly_menu['tisdag']['fish']
         assert 'Falafel med hummus' in weekly_menu['tisdag']['vegetarian']
 
     def test_parse_weekly_menu_with_category_markers(self, scraper, sample_html_with_category_markers):
         """Test parsing menu with category markers."""
-        soup = BeautifulSoup(sample_html_with_category_markers, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(sample_html_with_category_markers)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         assert 'måndag' in weekly_menu
         assert 'Biff med lök' in weekly_menu['måndag']['meat']
@@ -210,12 +219,16 @@ class TestKvartersmenynsMenuScraper:
     def test_parse_weekly_menu_no_menu_div(self, scraper):
         """Test parsing when menu div is not found."""
         html = "<html><body><div>No menu here</div></body></html>"
-        soup = BeautifulSoup(html, 'html.parser')
+        root = _parse_html(html)
 
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         assert weekly_menu == {}
 
+    def test_parse_weekly_menu_empty_page(self, scraper):
+        """Test parsing an empty page."""
+        assert scraper._parse_weekly_menu(_parse_html('')) == {}
+
     def test_parse_weekly_menu_stops_at_veckans_header(self, scraper):
         """Test that parsing stops at 'Veckans' header."""
         html = """
@@ -230,8 +243,8 @@ class TestKvartersmenynsMenuScraper:
         </body>
         </html>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(html)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         # Should have Monday but stop at "Veckans"
         assert 'måndag' in weekly_menu
@@ -249,8 +262,8 @@ class TestKvartersmenynsMenuScraper:
         </body>
         </html>
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(html)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         # <i> tag content should not appear
         for day_menu in weekly_menu.values():
@@ -258,35 +271,19 @@ class TestKvartersmenynsMenuScraper:
                 for dish in category_dishes:
                     assert '(invisible allergen code)' not in dish
 
-    @responses.activate
-    def test_get_menu_for_day(self, scraper, sample_html):
+    def test_get_menu_for_day(self, scraper, sample_page):
         """Test getting menu for a specific day."""
-        responses.add(
-            responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
-            body=sample_html,
-            status=200
-        )
-
         # Test Monday (weekday 0)
         test_date = date(2025, 1, 6)  # This is a Monday
         menu = scraper.get_menu_for_day(test_date)
 
         assert 'vegetarian' in menu
         assert 'meat' in menu
-        # Dish may be combined from multiple lines
-        assert any('Kycklingfilé med currysås' in dish for dish in menu['meat'])
+        # The dish is combined from two lines
+        assert 'Kycklingfilé med currysås serveras med ris' in menu['meat']
 
-    @responses.activate
-    def test_get_menu_for_day_tuesday(self, scraper, sample_html):
+    def test_get_menu_for_day_tuesday(self, scraper, sample_page):
         """Test getting menu for Tuesday."""
-        responses.add(
-            responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
-            body=sample_html,
-            status=200
-        )
-
         # Test Tuesday (weekday 1)
         test_date = date(2025, 1, 7)  # This is a Tuesday
         menu = scraper.get_menu_for_day(test_date)
@@ -310,7 +307,7 @@ class TestKvartersmenynsMenuScraper:
 
         responses.add(
             responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
+            MENU_URL,
             body=html,
             status=200
         )
@@ -321,26 +318,14 @@ class TestKvartersmenynsMenuScraper:
         with pytest.raises(Exception, match="No menu found for tisdag"):
             scraper.get_menu_for_day(test_date)
 
-    @responses.activate
-    def test_get_weekly_menu(self, scraper, sample_html):
+    def test_get_weekly_menu(self, scraper, sample_page):
         """Test getting the full weekly menu."""
-        responses.add(
-            responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
-            body=sample_html,
-            status=200
-        )
-
         weekly_menu = scraper.get_weekly_menu()
 
-        assert 'måndag' in weekly_menu
-        assert 'tisdag' in weekly_menu
-        assert 'onsdag' in weekly_menu
-        assert 'torsdag' in weekly_menu
-        assert 'fredag' in weekly_menu
+        assert weekly_menu.keys() >= {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag'}
 
-        # Verify some content (dishes may be combined from multiple lines)
-        assert any('Kycklingfilé med currysås' in dish for dish in weekly_menu['måndag']['meat'])
+        # Verify some content (Monday's dish is combined from two lines)
+        assert 'Kycklingfilé med currysås serveras med ris' in weekly_menu['måndag']['meat']
         assert 'Lax med citron och dill' in weekly_menu['tisdag']['fish']
         assert 'Halloumi med rostade grönsaker' in weekly_menu['torsdag']['vegetarian']
 
@@ -349,7 +334,7 @@ class TestKvartersmenynsMenuScraper:
         """Test weekly menu fetch failure."""
         responses.add(
             responses.GET,
-            'https://kvartersmenyn.se/filmhuset',
+            MENU_URL,
             status=500
         )
 
@@ -388,8 +373,8 @@ class TestKvartersmenynsMenuScraperWithRealFixtures:
             restaurant_name="Filmhuset"
         )
 
-        soup = BeautifulSoup(html, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(html)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         # Basic validation that we got a menu
         assert isinstance(weekly_menu, dict), f"Failed to parse menu for {fixture_date}"
@@ -397,14 +382,11 @@ class TestKvartersmenynsMenuScraperWithRealFixtures:
 
         # Check that we have expected weekdays
         valid_days = {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag'}
-        for day in weekly_menu.keys():
-            assert day in valid_days, f"Unexpected day '{day}' in menu for {fixture_date}"
+        assert weekly_menu.keys() <= valid_days, f"Unexpected days {weekly_menu.keys() - valid_days} in menu for {fixture_date}"
 
         # Check that each day has the expected structure
         for day, menu in weekly_menu.items():
-            assert 'vegetarian' in menu, f"Missing 'vegetarian' category for {day} on {fixture_date}"
-            assert 'fish' in menu, f"Missing 'fish' category for {day} on {fixture_date}"
-            assert 'meat' in menu, f"Missing 'meat' category for {day} on {fixture_date}"
+            assert menu.keys() == {'vegetarian', 'fish', 'meat'}, f"Unexpected categories for {day} on {fixture_date}"
 
             # Check that we have at least some dishes
             total_dishes = len(menu['vegetarian']) + len(menu['fish']) + len(menu['meat'])
@@ -428,8 +410,8 @@ class TestKvartersmenynsMenuScraperWithRealFixtures:
             restaurant_name="Karavan"
         )
 
-        soup = BeautifulSoup(html, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(html)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         # Basic validation that we got a menu
         assert isinstance(weekly_menu, dict), f"Failed to parse menu for {fixture_date}"
@@ -437,14 +419,11 @@ class TestKvartersmenynsMenuScraperWithRealFixtures:
 
         # Check that we have expected weekdays
         valid_days = {'måndag', 'tisdag', 'onsdag', 'torsdag', 'fredag'}
-        for day in weekly_menu.keys():
-            assert day in valid_days, f"Unexpected day '{day}' in menu for {fixture_date}"
+        assert weekly_menu.keys() <= valid_days, f"Unexpected days {weekly_menu.keys() - valid_days} in menu for {fixture_date}"
 
         # Check that each day has the expected structure
         for day, menu in weekly_menu.items():
-            assert 'vegetarian' in menu, f"Missing 'vegetarian' category for {day} on {fixture_date}"
-            assert 'fish' in menu, f"Missing 'fish' category for {day} on {fixture_date}"
-            assert 'meat' in menu, f"Missing 'meat' category for {day} on {fixture_date}"
+            assert menu.keys() == {'vegetarian', 'fish', 'meat'}, f"Unexpected categories for {day} on {fixture_date}"
 
             # Check that we have at least some dishes
             total_dishes = len(menu['vegetarian']) + len(menu['fish']) + len(menu['meat'])
@@ -473,8 +452,8 @@ class TestKvartersmenynsMenuScraperWithRealFixtures:
             restaurant_name=restaurant
         )
 
-        soup = BeautifulSoup(html, 'html.parser')
-        weekly_menu = scraper._parse_weekly_menu(soup)
+        root = _parse_html(html)
+        weekly_menu = scraper._parse_weekly_menu(root)
 
         # Should successfully parse and return a menu
         assert isinstance(weekly_menu, dict)
@@ -483,6 +462,4 @@ class TestKvartersmenynsMenuScraperWithRealFixtures:
         # Verify menu structure
         for day, menu in weekly_menu.items():
             assert isinstance(menu, dict)
-            assert 'vegetarian' in menu
-            assert 'fish' in menu
-            assert 'meat' in menu
+            assert menu.keys() == {'vegetarian', 'fish', 'meat'}
@@ -0,0 +1,294 @@
+"""Tests for the MCP server."""
+
+import asyncio
+import time
+from datetime import date, timedelta
+
+import pytest
+import requests
+from lunchscraper import cache, mcp_server
+
+MENU = {'vegetarian': ['Falafel med hummus'], 'fish': ['Lax med dillsås'], 'meat': ['Biff med lök']}
+EMPTY_MENU = {'vegetarian': [], 'fish': [], 'meat': []}
+
+
+class FakeScraper:
+    """Scraper stand-in that counts its fetches."""
+
+    def __init__(self, restaurant_key):
+        self.restaurant_key = restaurant_key
+        self.calls = []
+
+    def get_menu_for_day(self, target_date=None):
+        self.calls.append(('day', target_date))
+        return MENU
+
+    def get_weekly_menu(self):
+        self.calls.append(('week', None))
+        return {'måndag': MENU, 'tisdag': EMPTY_MENU}
+
+
+class FakeContext:
+    """Tool context stand-in that records (or fails) progress notifications."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.progress = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        if self.error:
+            raise self.error
+        self.progress.append((progress, total, message))
+
+
+# The real factory, before the tests stub it out
+create_scraper = mcp_server._create_scraper
+
+
+@pytest.fixture(autouse=True)
+def server(tmp_path, monkeypatch):
+    """Use a temporary cache, empty in-memory caches and stubbed scrapers."""
+    monkeypatch.setenv('RHLUNCH_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('RHLUNCH_CACHE_TTL', raising=False)
+    monkeypatch.setattr(mcp_server, '_create_scraper', FakeScraper)
+    monkeypatch.setattr(mcp_server, '_menu_cache', {})
+    monkeypatch.setattr(mcp_server, '_scrapers', {})
+    return mcp_server
+
+
+def scraper_calls(restaurant_key):
+    """Get the fetches made by the shared scraper for a restaurant."""
+    return mcp_server._get_scraper(restaurant_key)[0].calls
+
+
+class TestMenuCacheTTL:
+    """Tests for the MCP menu cache TTL."""
+
+    @pytest.fixture(autouse=True)
+    def no_cut_off(self, monkeypatch):
+        """Leave out the cut-off at the menu update, tested with the cache module."""
+        monkeypatch.setattr(cache, 'menu_ttl', lambda ttl: ttl)
+
+    def test_default(self):
+        """Test the default TTL."""
+        assert mcp_server._menu_cache_ttl() == mcp_server.MENU_CACHE_TTL
+
+    def test_override(self, monkeypatch):
+        """Test that $RHLUNCH_CACHE_TTL overrides the default."""
+        monkeypatch.setenv('RHLUNCH_CACHE_TTL', '120')
+
+        assert mcp_server._menu_cache_ttl() == 120
+
+    def test_invalid_override(self, monkeypatch):
+        """Test that an invalid $RHLUNCH_CACHE_TTL falls back to the default."""
+        monkeypatch.setenv('RHLUNCH_CACHE_TTL', 'an hour')
+
+        assert mcp_server._menu_cache_ttl() == mcp_server.MENU_CACHE_TTL
+
+    def test_cut_off(self, monkeypatch):
+        """Test that the TTL goes through the menu update cut-off."""
+        monkeypatch.setattr(cache, 'menu_ttl', lambda ttl: min(ttl, 30))
+
+        assert mcp_server._menu_cache_ttl() == 30
+
+
+class TestCached:
+    """Tests for the in-memory and on-disk menu cache."""
+
+    KEY = ('filmhuset', 2025, 45, 'week')
+
+    def test_miss_fetches_and_stores(self):
+        """Test that a miss calls fetch and stores the value on disk."""
+        assert mcp_server._cached(self.KEY, lambda: MENU) == MENU
+        assert cache.get(self.KEY) == MENU
+
+    def test_hit_in_memory(self):
+        """Test that a second call is served from memory."""
+        calls = []
+        mcp_server._cached(self.KEY, lambda: calls.append(1) or MENU)
+        cache.delete(self.KEY)
+
+        assert mcp_server._cached(self.KEY, lambda: calls.append(1) or MENU) == MENU
+        assert calls == [1]
+
+    def test_hit_on_disk(self):
+        """Test that a value stored by another process is used without fetching."""
+        cache.put(self.KEY, MENU, ttl=60)
+
+        assert mcp_server._cached(self.KEY, pytest.fail) == MENU
+
+    def test_disk_hit_kept_in_memory_no_longer_than_on_disk(self):
+        """Test that a value read from disk expires from memory with its disk entry."""
+        cache.put(self.KEY, MENU, ttl=10)
+        mcp_server._cached(self.KEY, pytest.fail)
+
+        expires = mcp_server._menu_cache[self.KEY][0]
+
+        assert expires <= time.monotonic() + 10
+
+    def test_fallback_is_not_cached(self, monkeypatch):
+        """Test that a value built from a stored page isn't cached."""
+        monkeypatch.setattr(cache, 'used_fallback', lambda: True)
+
+        assert mcp_server._cached(self.KEY, lambda: MENU) == MENU
+        assert cache.get(self.KEY) is None
+        assert self.KEY not in mcp_server._menu_cache
+
+
+class TestFetchMenus:
+    """Tests for fetching menus through the shared scrapers."""
+
+    def test_scrapers_are_shared(self):
+        """Test that each restaurant gets one scraper and lock."""
+        assert mcp_server._get_scraper('karavan') is mcp_server._get_scraper('karavan')
+        assert mcp_server._get_scraper('karavan') is not mcp_server._get_scraper('filmhuset')
+
+    def test_daily_menu_this_week_comes_from_weekly_menu(self):
+        """Test that a day in the current week is taken from the weekly menu."""
+        monday = date.today() - timedelta(days=date.today().weekday())
+
+        assert mcp_server._fetch_daily_menu('karavan', monday) == MENU
+        assert mcp_server._fetch_daily_menu('karavan', monday + timedelta(days=1)) == EMPTY_MENU
+        assert scraper_calls('karavan') == [('week', None)]
+
+    def test_daily_menu_missing_day(self):
+        """Test that a day missing from the weekly menu raises."""
+        sunday = date.today() + timedelta(days=6 - date.today().weekday())
+
+        with pytest.raises(Exception, match="No menu found for söndag"):
+            mcp_server._fetch_daily_menu('karavan', sunday)
+
+    def test_daily_menu_other_week(self):
+        """Test that a day in another week is fetched on its own."""
+        next_week = date.today() + timedelta(days=7)
+
+        assert mcp_server._fetch_daily_menu('gourmedia', next_week) == MENU
+        assert scraper_calls('gourmedia') == [('day', next_week)]
+
+    def test_unknown_restaurant(self):
+        """Test that an unknown restaurant key is rejected."""
+        with pytest.raises(ValueError, match="Unknown restaurant: nowhere"):
+            create_scraper('nowhere')
+
+
+class TestFormatting:
+    """Tests for the tool output helpers."""
+
+    @pytest.mark.parametrize("flags, categories", [
+        ({}, ['vegetarian', 'fish', 'meat']),
+        ({'vegetarian_only': True}, ['vegetarian']),
+        ({'fish_only': True}, ['fish']),
+        ({'meat_only': True}, ['meat']),
+    ])
+    def test_select_sections(self, flags, categories):
+        """Test that the dietary flags pick the menu sections."""
+        assert [category for category, _ in mcp_server._select_sections(**flags)] == categories
+
+    def test_error_message_walks_cause_chain(self):
+        """Test that a wrapped network error is reported briefly."""
+        try:
+            try:
+                raise requests.ConnectTimeout("HTTPSConnectionPool(host=...): Max retries exceeded")
+            except Exception as e:
+                raise Exception(f"Failed to fetch menu page: {e}")
+        except Exception as e:
+            error = e
+
+        assert mcp_server._error_message(error) == "Request timed out"
+
+    def test_error_message_connection_error(self):
+        """Test that connection errors are reported briefly."""
+        error = Exception("Failed to fetch menu")
+        error.__cause__ = requests.ConnectionError("Name or service not known")
+
+        assert mcp_server._error_message(error) == "Connection failed"
+
+    def test_error_message_other_error(self):
+        """Test that other errors are reported as is."""
+        assert mcp_server._error_message(Exception("No menu found for lördag")) == "No menu found for lördag"
+
+
+class TestTools:
+    """Tests for the MCP tools."""
+
+    def test_get_daily_menu(self):
+        """Test the daily menu tool for all restaurants."""
+        monday = date.today() - timedelta(days=date.today().weekday())
+
+        text = asyncio.run(mcp_server.get_daily_menu(vegetarian_only=True,
+                                                     target_date=monday.isoformat()))
+
+        for config in mcp_server.RESTAURANTS.values():
+            assert f"📍 {config['name']}" in text
+        assert 'Falafel med hummus' in text
+        assert 'Biff med lök' not in text
+
+    @pytest.mark.parametrize("target_date", ['4/11', '20251104', '2025-W45-2', '2025-11-4', '2025-02-30'])
+    def test_get_daily_menu_invalid_date(self, target_date):
+        """Test that anything but a valid YYYY-MM-DD date is rejected."""
+        text = asyncio.run(mcp_server.get_daily_menu(target_date=target_date))
+
+        assert text.startswith("Error: Invalid date")
+
+    def test_get_weekly_menu_unknown_restaurant(self):
+        """Test that an unknown restaurant is rejected."""
+        text = asyncio.run(mcp_server.get_weekly_menu(restaurant='nowhere'))
+
+        assert text.startswith("Error: Unknown restaurant 'nowhere'")
+
+    def test_get_weekly_menu_error(self, monkeypatch):
+        """Test that a failed fetch is reported for its restaurant only."""
+        def fail(scraper):
+            raise Exception("Failed to fetch menu") from requests.ConnectionError("down")
+        monkeypatch.setattr(FakeScraper, 'get_weekly_menu', fail)
+
+        text = asyncio.run(mcp_server.get_weekly_menu(restaurant='filmhuset'))
+
+        assert "❌ Error: Connection failed" in text
+
+    def test_progress_is_reported(self):
+        """Test that progress is reported once per restaurant."""
+        ctx = FakeContext()
+
+        asyncio.run(mcp_server.get_weekly_menu(ctx=ctx))
+
+        assert [progress for progress, _, _ in ctx.progress] == [1, 2, 3]
+        assert {total for _, total, _ in ctx.progress} == {3}
+
+    def test_failed_progress_report_keeps_menus(self):
+        """Test that a failed progress notification doesn't replace the fetched menus."""
+        ctx = FakeContext(error=RuntimeError("client went away"))
+
+        text = asyncio.run(mcp_server.get_weekly_menu(ctx=ctx))
+
+        assert "client went away" not in text
+        assert text.count('Falafel med hummus') == len(mcp_server.RESTAURANTS)
+
+
+class TestMain:
+    """Tests for choosing the MCP transport."""
+
+    @pytest.fixture
+    def run(self, monkeypatch):
+        """Record the transport the server is started with."""
+        runs = []
+        monkeypatch.setattr(mcp_server.mcp, 'run', lambda transport: runs.append(transport))
+        monkeypatch.setattr(mcp_server.mcp.settings, 'host', mcp_server.mcp.settings.host)
+        monkeypatch.setattr(mcp_server.mcp.settings, 'port', mcp_server.mcp.settings.port)
+        return runs
+
+    def test_stdio_by_default(self, run, monkeypatch):
+        """Test that stdio is used unless another transport is asked for."""
+        monkeypatch.delenv('RHLUNCH_TRANSPORT', raising=False)
+        mcp_server.main()
+
+        assert run == ['stdio']
+
+    def test_http(self, run, monkeypatch):
+        """Test that RHLUNCH_TRANSPORT=http serves streamable HTTP on the given port."""
+        monkeypatch.setenv('RHLUNCH_TRANSPORT', 'http')
+        monkeypatch.setenv('RHLUNCH_PORT', '8765')
+        mcp_server.main()
+
+        assert run == ['streamable-http']
+        assert mcp_server.mcp.settings.port == 8765